@@ -1,18 +1,143 @@
+import io
+import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
 
 # Importing your classes and functions
 import aspic_generator as ag
+import extensions
+import rule_parser
+import semantics
 
-# Function to display rules in a table
-def display_rules(rules):
-    if rules:
-        for rule in rules:
-            st.write(rule)  # Increase font size for better readability 
+PAGE_SIZES = [25, 50, 100, 500]
+
+# Columnar views of the results: one list per column, all of the same length
+
+def rule_columns(rules):
+    return {
+        "reference": [rule.reference for rule in rules],
+        "premises": [", ".join(map(str, rule.premises)) for rule in rules],
+        "conclusion": [str(rule.conclusion) for rule in rules],
+        "type": ["defeasible" if rule.is_defeasible else "strict" for rule in rules],
+        "weight": [rule.rule_weight for rule in rules],
+    }
+
+def argument_columns(arguments):
+    return {
+        "argument": [arg.name for arg in arguments],
+        "conclusion": [str(arg.top_rule.conclusion) for arg in arguments],
+        "top rule": [arg.top_rule.reference for arg in arguments],
+        "sub-arguments": [" ".join(sub_arg.name for sub_arg in arg.sub_arguments) for arg in arguments],
+        "defeasible": [arg.top_rule.is_defeasible for arg in arguments],
+    }
+
+def attack_columns(analysis):
+    columns = {"type": [], "on": [], "attacker": [], "target": []}
+    for attacker, target in analysis.undercuts:
+        columns["type"].append("undercut")
+        columns["on"].append(target.top_rule.reference)
+        columns["attacker"].append(attacker.name)
+        columns["target"].append(target.name)
+    for block in analysis.rebuttals.blocks:
+        label = str(block.label)
+        for attacker, target in block:
+            columns["type"].append("rebuttal")
+            columns["on"].append(label)
+            columns["attacker"].append(attacker.name)
+            columns["target"].append(target.name)
+    return columns
+
+def defeat_columns(defeats):
+    return {
+        "attacker": [attacker.name for attacker, _ in defeats],
+        "target": [target.name for _, target in defeats],
+    }
+
+def burden_columns(analysis):
+    ranked = analysis.ranked_arguments
+    columns = {"rank": list(range(1, len(ranked) + 1)), "argument": list(ranked)}
+    depths = len(analysis.burden_numbers[ranked[0]]) if ranked else 0
+    for depth in range(depths):
+        columns[f"depth {depth}"] = [analysis.burden_numbers[name][depth] for name in ranked]
+    return columns
+
+def semantics_columns(analysis):
+    # Position of every argument in the burden ranking and in each gradual semantics
+    comparison = semantics.compare_semantics(semantics.DefeatGraph.from_analysis(analysis))
+    burden_rank = {name: rank for rank, name in enumerate(analysis.ranked_arguments, start=1)}
+    names = [arg.name for arg in analysis.af.get_arguments()]
+    columns = {"argument": names, "burden": [burden_rank.get(name) for name in names]}
+    for name in semantics.SEMANTICS:
+        columns[name] = [comparison["positions"][argument][name] for argument in names]
+    for name in ("h-categorizer", "counting"):
+        scores = comparison["results"][name]["scores"]
+        columns[f"{name} score"] = [round(scores[argument], 6) for argument in names]
+    return columns
+
+def sort_rows(rows, values, descending):
+    # Rows without a value (None, e.g. the burden ranks of an interrupted analysis) go last,
+    # in either order
+    present = [row for row in rows if values[row] is not None]
+    missing = [row for row in rows if values[row] is None]
+    return sorted(present, key=values.__getitem__, reverse=descending) + missing
+
+# Search, sorting and paging all happen here on the server; only the rows of the
+# visible page are turned into a dataframe and sent to the browser
+def paginated_table(key, columns):
+    names = list(columns)
+    total = len(columns[names[0]]) if names else 0
+    search_col, sort_col, order_col, size_col = st.columns(4)
+    query = search_col.text_input("Search", key=f"{key}_search")
+    sort_by = sort_col.selectbox("Sort by", names, key=f"{key}_sort")
+    descending = order_col.checkbox("Descending", key=f"{key}_descending")
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    rows = range(total)
+    if query:
+        query = query.lower()
+        rows = [row for row in rows if any(query in str(columns[name][row]).lower() for name in names)]
+    if sort_by:
+        rows = sort_rows(rows, columns[sort_by], descending)
+
+    pages = max(1, -(-len(rows) // page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=page_key)
+    visible = rows[(page - 1) * page_size:page * page_size]
+    st.dataframe(pd.DataFrame({name: [columns[name][row] for row in visible] for name in names}),
+                 hide_index=True)
+    st.caption(f"{len(rows)} of {total} rows, page {page} of {pages}")
+
+# The analysis is kept across reruns (paging, searching...) until the rules, the depth, the
+# attack mode or the time budget change
+def get_analysis(rules, burden_depth, time_budget, attack_mode):
+    fingerprint = (tuple((rule, rule.rule_weight) for rule in rules), burden_depth, time_budget, attack_mode)
+    cached = st.session_state.get("analysis")
+    if cached is None or cached[0] != fingerprint:
+        st.session_state.pop("tables", None)
+        # Stored before running: pressing Stop reruns the script, which interrupts this run
+        # at its next progress update, and the next run shows the partial analysis
+        analysis = ag.Analysis(rules, attack_mode)
+        st.session_state["analysis"] = (fingerprint, analysis)
+        stages = len(ag.PIPELINE_STAGES)
+        progress = st.progress(0.0, text="Analysing the rule base...")
 
-def show_all_arguments(arguments):
-    for argument in arguments:
-        st.write(argument)
+        def on_progress(stage, done, total):
+            position = ag.PIPELINE_STAGES.index(stage)
+            fraction = min(done / total, 1.0) if total else 0.5
+            progress.progress((position + fraction) / stages, text=f"Computing {stage}...")
+
+        budget = ag.Budget(time_budget or None, on_progress=on_progress)
+        ag.run_analysis(analysis, max_depth=burden_depth, budget=budget)
+        progress.empty()
+    return st.session_state["analysis"][1]
+
+def get_table(name, build):
+    # Columns are built once per analysis, not on every rerun
+    tables = st.session_state.setdefault("tables", {})
+    if name not in tables:
+        tables[name] = build()
+    return tables[name]
 
 # Main function to run the Streamlit app
 def main(rules):
@@ -28,16 +153,14 @@ def main(rules):
 
     # Add form elements to the sidebar
     st.sidebar.write("Enter the premises and conclusion of the rule.")
-    st.sidebar.write("Separate premises with commas and a negative premise is '-'premise.")
+    st.sidebar.write("Separate premises with commas and a negative premise is '~'premise.")
     premises = st.sidebar.text_input("Premises", "")
-    premises = [literal.strip() for literal in premises.split(",")]
-    premises = [ag.Literal(literal[1:], is_negative=True) if literal.startswith("~") else ag.Literal(literal) for literal in premises]
+    premises = [ag.parse_literal(literal) for literal in premises.split(",") if literal.strip()]
     
     conclusion = st.sidebar.text_input("Conclusion", "")
-    conclusion = ag.Literal(conclusion[1:], is_negative=True) if conclusion.startswith("~") else ag.Literal(conclusion)
+    conclusion = ag.parse_literal(conclusion)
     
     is_defeasible = st.sidebar.checkbox("Is Defeasible")
-    #burden_depth = st.sidebar.number_input("Max Depth of burden", 3)
 
     if st.sidebar.button("Add Rule"):
         # Process the form inputs and create a rule
@@ -45,159 +168,123 @@ def main(rules):
         rules.append(new_rule)
         st.sidebar.success("Rule added successfully!")
 
-    # Display rules in a table on the main page
-    display_rules(rules)
+    # Load a whole rule base from a text file (see rule_parser.py for the format)
+    uploaded_file = st.sidebar.file_uploader("Upload rule file", type=["aspic", "txt"])
+    if uploaded_file is not None:
+        # Parsed once per upload, then kept across reruns
+        upload_key = (uploaded_file.name, uploaded_file.size)
+        if st.session_state.get("uploaded_key") != upload_key:
+            try:
+                uploaded_rules = list(rule_parser.iter_rules(io.TextIOWrapper(uploaded_file, encoding="utf-8"),
+                                                             uploaded_file.name))
+                st.session_state["uploaded_key"] = upload_key
+                st.session_state["uploaded_rules"] = uploaded_rules
+                st.sidebar.success(f"Rules loaded from {uploaded_file.name}!")
+            except rule_parser.RuleSyntaxError as error:
+                st.sidebar.error(f"Invalid rule file: {error}")
+            except UnicodeDecodeError:
+                st.sidebar.error(f"Invalid rule file: {uploaded_file.name} is not UTF-8 text")
+    else:
+        st.session_state.pop("uploaded_key", None)
+        st.session_state.pop("uploaded_rules", None)
+    rules = rules + st.session_state.get("uploaded_rules", [])
 
     # Option to load rules from aspicGenerator
-
     if use_our_set:
         # Load rules from aspicGenerator
-        rules = []
-        rules.extend(ag.rules)
+        rules = list(ag.rules)
         st.sidebar.success("Rules loaded from aspicGenerator!")
-        display_rules(rules)
-    
-    # Button to execute create_contrapositions
-    if st.sidebar.button(''' Create Contrapositions rules '''):
-        # Generate contraposition rules
-        strict_rules = ag.strict_rules
-        contraposition_rules = ag.create_contrapositions(strict_rules, len(rules))
-        
-        # Create ArgumentationFramework object
-        af = ag.ArgumentationFramework(rules + contraposition_rules)
+
+    # Display rules in a table on the main page
+    if rules:
+        st.header("Rules")
+        paginated_table("rules", rule_columns(rules))
+
+    burden_depth = st.sidebar.number_input("Max Depth of burden", placeholder=3, min_value=1, max_value=10, value=3)
+    attack_mode = st.sidebar.selectbox("Attacks", ag.ATTACK_MODES,
+                                       format_func={"unrestricted": "unrestricted rebut + undercut",
+                                                    "restricted": "restricted rebut + undercut",
+                                                    "undercut": "undercut only"}.get)
+    graph_mode = st.sidebar.selectbox("Graph nodes", ["argument", "conclusion", "scc"])
+    max_edges = st.sidebar.number_input("Max edges drawn", min_value=10, max_value=100000, value=2000)
+    time_budget = st.sidebar.number_input("Time budget in seconds (0 = no limit)", min_value=0.0, value=0.0)
+    # Clicking either button reruns the script, which also interrupts a running analysis
+    stop_col, restart_col = st.sidebar.columns(2)
+    stop_col.button("Stop analysis")
+    if restart_col.button("Run again"):
+        st.session_state.pop("analysis", None)
+
+    # Each button selects the view to show; the view stays selected across reruns
+    views = {
+        "contrapositions": ''' Create Contrapositions rules ''',
+        "arguments": ''' # generate Arguments''',
+        "attacks": '''generate Attacks''',
+        "defeats": '''# Generate defeats''',
+        "histogram": '''# Generate historgramme''',
+        "burden": '''# Burden''',
+        "semantics": '''# Compare ranking semantics''',
+        "extensions": '''# Check an extension''',
+    }
+    for view, label in views.items():
+        if st.sidebar.button(label):
+            st.session_state["view"] = view
+    view = st.session_state.get("view")
+    if view is None:
+        return
+    analysis = get_analysis(rules, burden_depth, time_budget, attack_mode)
+    if not analysis.complete:
+        st.warning("Partial results: the analysis was stopped before finishing "
+                   f"{', '.join(analysis.incomplete)}. Raise the time budget or click 'Run again'.")
+    if analysis.af is None:
+        return
+
+    if view == "contrapositions":
         st.header("Contraposition Rules")
-        display_rules(contraposition_rules)
-    
-    # Button to show arguments
-    if st.sidebar.button(''' # generate Arguments'''):
-        # Generate arguments
-        strict_rules = ag.strict_rules
-        contraposition_rules = ag.create_contrapositions(strict_rules, len(rules))
-        af = ag.ArgumentationFramework(rules + contraposition_rules)
-        arguments = af.get_arguments()
+        paginated_table("contrapositions", get_table("contrapositions",
+                                                     lambda: rule_columns(analysis.contraposition_rules)))
+    elif view == "arguments":
         st.header(''' Arguments''')
-        show_all_arguments(arguments)
-
-    if st.sidebar.button('''generate Attacks'''):
-        # Generate attacks
-        strict_rules = ag.strict_rules
-        contraposition_rules = ag.create_contrapositions(strict_rules, len(rules))
-        af = ag.ArgumentationFramework(rules + contraposition_rules)
-        attacks = af.get_attacks()
-        st.write(''' # Attacks''')
-        undercuts = af.detect_undercuts()
-        st.write('''## Undercuts''')
-        for attacker, target in undercuts:
-            printed = f'{attacker.name} undercuts {target.name}'
-            st.write(printed)
-        # generate rebuttals too
-        st.write('''# rebuttals''')
-        rebuttal_attacks = ag.find_rebuttal_attacks(af.get_arguments())
-        for literal, arguments in rebuttal_attacks.items():
-            rebuttal_attacks[literal] = list(set(rebuttal_attacks[literal]))
-        extended_rebuttals = ag.extend_argument_chains(af.get_arguments(), rebuttal_attacks)
-        rebuttals_tuples = ag.tuple_of_rubutlals(extended_rebuttals,af.get_arguments())
-        counter = 0
-        all_attacks = []
-        for attacked , attackers in rebuttals_tuples.items():
-            st.write(f'* Rebuttal attacks against {attacked}:')
-            for i in range(0, len(attackers), 9):
-                # Create an empty list to store the output for this group of ten tuples
-                output_strings = []
-                # Iterate through ten tuples or the remaining tuples if less than ten
-                for attacker_tuple in attackers[i:i+9]:
-                    # Create an empty string to store the output for this tuple
-                    output_string = "("
-                    # Add each tuple's field names to the output string
-                    for attacker in attacker_tuple:
-                        output_string += attacker.name + ', '  # Assuming 'name' is the attribute you want to print
-                    # Remove the trailing comma and space
-                    output_string = output_string.rstrip(', ')
-                    output_string += ") , "
-                    # Append the output for this tuple to the list
-                    output_strings.append(output_string)
-                # Display the output for this group of ten tuples
-                output_strings[-1] = output_strings[-1].rstrip(', ')
-                st.write(' '.join(output_strings))
-
-            all_attacks.extend(attackers)
-            st.write("counted :", len(attackers))
-            counter += len(attackers)
-        st.write("number of rebuttals attacks:", counter)
+        paginated_table("arguments", get_table("arguments", lambda: argument_columns(analysis.af.get_arguments())))
+    elif view == "attacks":
+        st.header("Attacks")
+        st.write("number of undercuts:", len(analysis.undercuts))
+        st.write("number of rebuttals attacks:", len(analysis.rebuttals))
         # total number of attacks undercuts and rebuttals
-        all_attacks.extend(undercuts)
-        st.write("total number of attacks (undercuts and rebuttals):", len(all_attacks))
-    if st.sidebar.button('''# Generate defeats'''):
-        # Generate defeats
-        strict_rules = ag.strict_rules
-        contraposition_rules = ag.create_contrapositions(strict_rules, len(rules))
-        af = ag.ArgumentationFramework(rules + contraposition_rules)
-        attacks = af.get_attacks()
-        undercuts = af.detect_undercuts()
-        rebuttal_attacks = ag.find_rebuttal_attacks(af.get_arguments())
-        for literal, arguments in rebuttal_attacks.items():
-            rebuttal_attacks[literal] = list(set(rebuttal_attacks[literal]))
-        extended_rebuttals = ag.extend_argument_chains(af.get_arguments(), rebuttal_attacks)
-        rebuttals_tuples = ag.tuple_of_rubutlals(extended_rebuttals,af.get_arguments())
-        counter = 0
-        all_attacks = []
-        for attacked , attackers in rebuttals_tuples.items():
-            all_attacks.extend(attackers)
-        all_attacks.extend(undercuts)
-        defeats = ag.find_defeated(all_attacks)
+        st.write("total number of attacks (undercuts and rebuttals):", analysis.count_attacks())
+        paginated_table("attacks", get_table("attacks", lambda: attack_columns(analysis)))
+    elif view == "defeats":
         st.header("Defeats")
         #afficher nombre de defaites
-        st.write(defeats.__repr__())
-        st.write("number of defeats:", len(defeats))
-    if st.sidebar.button('''# Generate historgramme'''):
-        strict_rules = ag.strict_rules
-        contraposition_rules = ag.create_contrapositions(strict_rules, len(rules))
-        af = ag.ArgumentationFramework(rules + contraposition_rules)
-        attacks = af.get_attacks()
-        undercuts = af.detect_undercuts()
-        rebuttal_attacks = ag.find_rebuttal_attacks(af.get_arguments())
-        for literal, arguments in rebuttal_attacks.items():
-            rebuttal_attacks[literal] = list(set(rebuttal_attacks[literal]))
-        extended_rebuttals = ag.extend_argument_chains(af.get_arguments(), rebuttal_attacks)
-        rebuttals_tuples = ag.tuple_of_rubutlals(extended_rebuttals,af.get_arguments())
-        counter = 0
-        all_attacks = []
-        for attacked , attackers in rebuttals_tuples.items():
-            all_attacks.extend(attackers)
-        all_attacks.extend(undercuts)
-        defeats = ag.find_defeated(all_attacks)
-        plot = ag.generate_histogram(defeats)
+        st.write("number of defeats:", len(analysis.defeats))
+        paginated_table("defeats", get_table("defeats", lambda: defeat_columns(analysis.defeats)))
+    elif view == "histogram":
+        plot = ag.generate_histogram(analysis.defeats)
         st.header("Histogramme")
         st.pyplot(plot)
         st.header("Argument Graph")
-        graph = ag.create_argument_graph(af.get_arguments(), all_attacks)
+        graph = ag.create_argument_graph(analysis.af.get_arguments(), analysis.attacks(),
+                                         collapse=None if graph_mode == "argument" else graph_mode,
+                                         max_edges=max_edges)
         st.pyplot(graph)
-    if st.sidebar.button('''# Burden'''):
-        strict_rules = ag.strict_rules
-        contraposition_rules = ag.create_contrapositions(strict_rules, len(rules))
-        af = ag.ArgumentationFramework(rules + contraposition_rules)
-        attacks = af.get_attacks()
-        undercuts = af.detect_undercuts()
-        rebuttal_attacks = ag.find_rebuttal_attacks(af.get_arguments())
-        for literal, arguments in rebuttal_attacks.items():
-            rebuttal_attacks[literal] = list(set(rebuttal_attacks[literal]))
-        extended_rebuttals = ag.extend_argument_chains(af.get_arguments(), rebuttal_attacks)
-        rebuttals_tuples = ag.tuple_of_rubutlals(extended_rebuttals,af.get_arguments())
-        counter = 0
-        all_attacks = []
-        for attacked , attackers in rebuttals_tuples.items():
-            all_attacks.extend(attackers)
-        all_attacks.extend(undercuts)
-        defeats = ag.find_defeated(all_attacks)
-        burden_depth = st.sidebar.number_input("Max Depth of burden", placeholder=3, min_value=1, max_value=10, value=3)
-        burden_numbers = af.compute_burdens_with_defeats(defeats, max_depth=burden_depth)
-        ranked_arguments = af.rank_arguments_with_defeats(burden_numbers)
-        st.write(burden_depth)
-        for arg in ranked_arguments:
-            st.write(f"Argument: {arg}, Burden: {burden_numbers[arg]}")
-        
+    elif view == "burden":
+        st.header("Burden ranking")
+        paginated_table("burden", get_table("burden", lambda: burden_columns(analysis)))
+    elif view == "semantics":
+        st.header("Ranking semantics")
+        st.write("Position of each argument in the burden ranking and in the h-categorizer, "
+                 "counting and discussion-based rankings of the defeat graph (1 is best).")
+        paginated_table("semantics", get_table("semantics", lambda: semantics_columns(analysis)))
+    elif view == "extensions":
+        st.header("Check an extension")
+        names = [arg.name for arg in analysis.af.get_arguments()]
+        selection = st.multiselect("Arguments in the extension", names)
+        checks = extensions.verify_extensions(analysis, [selection])
+        st.dataframe(pd.DataFrame({"property": list(checks),
+                                   "holds": [bool(values[0]) for values in checks.values()]}),
+                     hide_index=True)
+
 
 if __name__ == "__main__":
-    # Initialize an empty list to store rules
-    rules = []
+    # Rules added from the sidebar are kept in the session so they survive reruns
+    rules = st.session_state.setdefault("rules", [])
     main(rules)
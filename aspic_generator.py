@@ -1,32 +1,87 @@
 
+import bisect
+import heapq
 import itertools
+import random
+import threading
+import time
+from array import array
 import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+from concurrent.futures import ThreadPoolExecutor
 from operator import itemgetter
+from collections import Counter, OrderedDict
+
+from storage import AttackStore
 
 class Literal:
-    def __init__(self, name, is_negative=False):
-        self.name = name
-        self.is_negative = is_negative
-    
+    # Literals are interned: Literal('a') always returns the same object. The positive
+    # literal of an atom gets an even id and its negation the next odd one, so negating
+    # is a bit flip on the id.
+    __slots__ = ('name', 'is_negative', 'id', '_hash')
+    _table = {}
+    _by_id = []
+    _lock = threading.Lock()
+
+    def __new__(cls, name, is_negative=False):
+        key = (name, bool(is_negative))
+        literal = cls._table.get(key)
+        if literal is None:
+            with cls._lock:
+                literal = cls._table.get(key)
+                if literal is None:
+                    # Intern the atom and its negation together so their ids differ in the last bit only
+                    for negative in (False, True):
+                        new_literal = object.__new__(cls)
+                        new_literal.name = name
+                        new_literal.is_negative = negative
+                        new_literal.id = len(cls._by_id)
+                        new_literal._hash = hash((name, negative))
+                        cls._by_id.append(new_literal)
+                        cls._table[(name, negative)] = new_literal
+                    literal = cls._table[key]
+        return literal
+
+    @classmethod
+    def from_id(cls, literal_id):
+        return cls._by_id[literal_id]
+
+    def negate(self):
+        return Literal._by_id[self.id ^ 1]
+
     def __repr__(self):
         return f"{'¬' if self.is_negative else ''}{self.name}"
 
     def __eq__(self, other):
         if not isinstance(other, Literal):
             return NotImplemented
-        return self.name == other.name and self.is_negative == other.is_negative
+        return self is other
 
     def __hash__(self):
-        return hash((self.name, self.is_negative))
+        return self._hash
+
+    def __reduce__(self):
+        # Re-intern on unpickling (ids are only meaningful inside one process)
+        return (Literal, (self.name, self.is_negative))
+
+def parse_literal(text):
+    # 'a' is a positive literal, '~a' (or '¬a') its negation
+    text = text.strip()
+    if text[:1] in ('~', '¬'):
+        return Literal(text[1:].strip(), is_negative=True)
+    return Literal(text)
 
 class Rule:
+    __slots__ = ('premises', 'conclusion', 'is_defeasible', 'reference', 'rule_weight', '_hash')
+
     def __init__(self, premises, conclusion, is_defeasible=False, reference='', rule_weight=0):
         self.premises = frozenset(premises)  # Convertit les prémises en frozenset
         self.conclusion = conclusion
         self.is_defeasible = is_defeasible
         self.reference = reference
         self.rule_weight = rule_weight
+        self._hash = hash((self.premises, self.conclusion, self.is_defeasible, self.reference))
     
     def __repr__(self):
         premises_str = ', '.join(map(str, self.premises))
@@ -34,55 +89,354 @@ class Rule:
     def __eq__(self, other):
         if not isinstance(other, Rule):
             return NotImplemented
-        return (self.premises == other.premises and self.conclusion == other.conclusion and 
+        if self is other:
+            return True
+        return (self._hash == other._hash and self.premises == other.premises and self.conclusion == other.conclusion and
                 self.is_defeasible == other.is_defeasible and self.reference == other.reference)
 
     def __hash__(self):
-        return hash((self.premises, self.conclusion, self.is_defeasible, self.reference))
+        return self._hash
 
 class Argument:
-    def __init__(self, top_rule, sub_arguments, name):
+    # Thin view of an argument record: 'id' is its index in the framework's ArgumentArena,
+    # and the sub-arguments are read from the arena's sub-argument ids when asked for.
+    # Two views are equal when they stand for the same record of the same framework, which
+    # is also how the arena tells arguments apart (top rule and sub-arguments).
+    __slots__ = ('top_rule', 'name', 'id', 'framework')
+
+    def __init__(self, top_rule, name, id, framework):
         self.top_rule = top_rule
-        self.sub_arguments = frozenset(sub_arguments)  # Convertit sub_arguments en frozenset
         self.name = name
+        self.id = id
+        self.framework = framework
+
+    @property
+    def sub_arguments(self):
+        arguments = self.framework.arguments
+        return tuple(arguments[sub_id] for sub_id in self.framework.arena.sub_argument_ids(self.id))
 
     def __repr__(self):
         rule_symbol = '⇒' if self.top_rule.is_defeasible else '→'
-        if not self.sub_arguments:
+        sub_arguments = self.sub_arguments
+        if not sub_arguments:
             premises_str = ', '.join(map(str, self.top_rule.premises))
             return f"{self.name}:{premises_str} {rule_symbol} {self.top_rule.conclusion}"
         else:
-            sub_args_repr = " ".join(arg.name for arg in self.sub_arguments)
+            sub_args_repr = " ".join(arg.name for arg in sub_arguments)
             return f"{self.name}: {sub_args_repr} {rule_symbol} {self.top_rule.conclusion}"
         
     def __eq__(self, other):
-        return isinstance(other, Argument) and \
-            self.top_rule.conclusion == other.top_rule.conclusion and \
-            self.sub_arguments == other.sub_arguments
+        if self is other:
+            return True
+        return isinstance(other, Argument) and self.id == other.id and self.framework is other.framework
 
     def __hash__(self):
-        return hash((self.top_rule.conclusion, self.sub_arguments))
+        return self.id
+
+
+def _sorted_slice_contains(column, start, stop, value):
+    # Whether the sorted column[start:stop] holds value, without copying the slice
+    position = bisect.bisect_left(column, value, start, stop)
+    return position < stop and column[position] == value
+
+
+class ArgumentArena:
+    # Arguments stored as integer records: the top-rule id of each argument, and its
+    # sub-argument ids laid out contiguously (sub_ids[sub_offsets[i]:sub_offsets[i + 1]]).
+    # Sub-arguments always get smaller ids than the arguments built on them, so the records
+    # form a DAG in construction order and the closures below are computed once, when an
+    # argument is added, from those of its direct sub-arguments. They are sorted id lists in
+    # the same CSR layout, so each takes space in proportion to its own size:
+    #   - closure_ids(i):   the argument ids in argument i (i itself included), stored in
+    #                       closure_id_column[closure_offsets[i]:closure_offsets[i + 1]]
+    #   - rule_ids_used(i): the rule ids used anywhere in argument i (rule_id_column, rule_offsets)
+    #   - depths[i]:        0 for a fact, 1 + the deepest sub-argument otherwise
+    #
+    # With a storage.SpillStore every column is an append-only file instead of an array, and
+    # the dedup index only keeps a hash per argument and checks candidates against the columns.
+    # That index is still an in-memory dict with one entry per argument (about 100 bytes
+    # each), so spilling bounds memory by the number of arguments, not by their size or by
+    # the number of attacks: ten million arguments still need about a gigabyte for it.
+    def __init__(self, spill=None):
+        self.spill = spill
+        self.top_rule_ids = self._column('top_rule_ids', 'i')
+        self.sub_offsets = self._column('sub_offsets', 'q')
+        self.sub_offsets.append(0)
+        self.sub_ids = self._column('sub_ids', 'i')
+        self.depths = self._column('depths', 'i')
+        self.index = {}  # (top-rule id, sorted sub-argument ids), or its hash when spilled -> argument id
+        self.closure_offsets = self._column('closure_offsets', 'q')
+        self.closure_offsets.append(0)
+        self.closure_id_column = self._column('closure_ids', 'i')
+        self.rule_offsets = self._column('rule_offsets', 'q')
+        self.rule_offsets.append(0)
+        self.rule_id_column = self._column('rule_ids', 'i')
+
+    def _column(self, name, typecode):
+        return array(typecode) if self.spill is None else self.spill.column(name, typecode)
+
+    def __len__(self):
+        return len(self.top_rule_ids)
+
+    def _lookup(self, key):
+        if self.spill is None:
+            return self.index.get(key)
+        candidates = self.index.get(hash(key))
+        if candidates is None:
+            return None
+        for argument_id in candidates if isinstance(candidates, list) else (candidates,):
+            if self.top_rule_ids[argument_id] == key[0] and self.sub_argument_ids(argument_id) == key[1]:
+                return argument_id
+        return None
+
+    def _remember(self, key, argument_id):
+        if self.spill is None:
+            self.index[key] = argument_id
+            return
+        existing = self.index.setdefault(hash(key), argument_id)
+        if existing != argument_id:
+            # Hash collision: keep every candidate
+            if isinstance(existing, list):
+                existing.append(argument_id)
+            else:
+                self.index[hash(key)] = [existing, argument_id]
+
+    def find(self, rule_id, sub_ids):
+        return self._lookup((rule_id, tuple(sorted(sub_ids))))
+
+    def add(self, rule_id, sub_ids):
+        key = (rule_id, tuple(sorted(sub_ids)))
+        argument_id = self._lookup(key)
+        if argument_id is None:
+            argument_id = len(self.top_rule_ids)
+            self.top_rule_ids.append(rule_id)
+            self.sub_ids.extend(key[1])
+            self.sub_offsets.append(len(self.sub_ids))
+            self._remember(key, argument_id)
+            # The new id is larger than every id in the sub-argument closures, so it goes last
+            if len(key[1]) == 1:
+                # The common case: the sub-argument's lists, already sorted, are reused as is
+                sub_id = key[1][0]
+                depth = self.depths[sub_id]
+                closure = self.closure_ids(sub_id)
+                rules_used = self.rule_ids_used(sub_id)
+                if not _sorted_slice_contains(rules_used, 0, len(rules_used), rule_id):
+                    rules_used = list(rules_used)
+                    bisect.insort(rules_used, rule_id)
+            else:
+                depth = -1
+                closure = set()
+                rules_used = {rule_id}
+                for sub_id in key[1]:
+                    depth = max(depth, self.depths[sub_id])
+                    closure.update(self.closure_ids(sub_id))
+                    rules_used.update(self.rule_ids_used(sub_id))
+                closure = sorted(closure)
+                rules_used = sorted(rules_used)
+            self.depths.append(depth + 1)
+            self.closure_id_column.extend(closure)
+            self.closure_id_column.append(argument_id)
+            self.closure_offsets.append(len(self.closure_id_column))
+            self.rule_id_column.extend(rules_used)
+            self.rule_offsets.append(len(self.rule_id_column))
+        return argument_id
+
+    def top_rule_id(self, argument_id):
+        return self.top_rule_ids[argument_id]
+
+    def sub_argument_ids(self, argument_id):
+        return tuple(self.sub_ids[self.sub_offsets[argument_id]:self.sub_offsets[argument_id + 1]])
+
+    def closure_ids(self, argument_id):
+        # Ids of the argument and of all its sub-arguments, in increasing order
+        return self.closure_id_column[self.closure_offsets[argument_id]:self.closure_offsets[argument_id + 1]]
+
+    def rule_ids_used(self, argument_id):
+        return self.rule_id_column[self.rule_offsets[argument_id]:self.rule_offsets[argument_id + 1]]
+
+    def premise_ids(self, argument_id):
+        # The arguments without sub-arguments (facts) the argument is built from
+        offsets = self.sub_offsets
+        return [i for i in self.closure_ids(argument_id) if offsets[i] == offsets[i + 1]]
+
+    def contains(self, argument_id, sub_id):
+        # Whether sub_id is argument_id or one of its (direct or indirect) sub-arguments,
+        # by binary search in the argument's closure
+        if sub_id > argument_id:
+            return False
+        return _sorted_slice_contains(self.closure_id_column, self.closure_offsets[argument_id],
+                                      self.closure_offsets[argument_id + 1], sub_id)
+
+    def uses_rule_id(self, argument_id, rule_id):
+        return _sorted_slice_contains(self.rule_id_column, self.rule_offsets[argument_id],
+                                      self.rule_offsets[argument_id + 1], rule_id)
+
+    def parent_index(self):
+        # (offsets, parent ids) CSR of the reverse sub-argument relation, built in one pass
+        # over the sub-argument columns; the result is written to new columns when spilled
+        n = len(self)
+        sub_ids = np.asarray(self.sub_ids if self.spill is None else self.sub_ids.view(), dtype=np.intp)
+        sub_offsets = np.asarray(self.sub_offsets if self.spill is None else self.sub_offsets.view(), dtype=np.intp)
+        owners = np.repeat(np.arange(n, dtype=np.intp), np.diff(sub_offsets))
+        parents = owners[np.argsort(sub_ids, kind='stable')]
+        offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(sub_ids, minlength=n), out=offsets[1:])
+        if self.spill is None:
+            return offsets, parents
+        offset_column = self.spill.column('parent_offsets', 'q')
+        offset_column.extend_array(offsets)
+        parent_column = self.spill.column('parent_ids', 'i')
+        parent_column.extend_array(parents)
+        return offset_column, parent_column
+
+
+class Budget:
+    # Deadline and cancellation token shared by the pipeline stages. Long loops call
+    # should_stop(); once the deadline has passed or cancel() was called (from any
+    # thread), they stop early and keep what they have computed so far, and 'interrupted'
+    # tells the caller that the results are partial.
+    def __init__(self, seconds=None, on_progress=None, progress_interval=0.1):
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.cancelled = threading.Event()
+        self.interrupted = False
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._last_report = 0.0
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def expired(self):
+        return self.cancelled.is_set() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def should_stop(self):
+        if self.expired():
+            self.interrupted = True
+        return self.interrupted
+
+    def report(self, stage, done, total=None, force=False):
+        # Forwards progress to on_progress(stage, done, total), at most every progress_interval seconds
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            self.on_progress(stage, done, total)
+
+
+def _should_stop(budget):
+    return budget is not None and budget.should_stop()
+
+def _report(budget, stage, done, total=None):
+    if budget is not None:
+        budget.report(stage, done, total)
+
+
+class SpilledArguments:
+    # Sequence view of the arguments of a spilled framework: Argument objects are rebuilt
+    # from the arena when accessed, and only the most recently used ones are kept
+    def __init__(self, af, cache_size=1 << 16):
+        self.af = af
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def __len__(self):
+        return len(self.af.arena)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        argument = self.cache.get(index)
+        if argument is not None:
+            self.cache.move_to_end(index)
+            return argument
+        arena = self.af.arena
+        if not 0 <= index < len(arena):
+            raise IndexError('argument id out of range')
+        # Ids follow creation order, so names can be rebuilt from them
+        argument = Argument(self.af.rules[arena.top_rule_ids[index]], f'A{index + 1}', index, self.af)
+        self.remember(argument)
+        return argument
+
+    def remember(self, argument):
+        self.cache[argument.id] = argument
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def clear(self):
+        self.cache.clear()
+
+
+class ArgumentIds:
+    # List-like group of arguments stored as an array of ids (spilled frameworks)
+    def __init__(self, arguments, ids=()):
+        self.arguments = arguments
+        self.ids = array('i', ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.arguments[i] for i in self.ids[index]]
+        return self.arguments[self.ids[index]]
+
+    def __iter__(self):
+        arguments = self.arguments
+        for argument_id in self.ids:
+            yield arguments[argument_id]
+
+    def append(self, argument):
+        self.ids.append(argument.id)
 
 
 class ArgumentationFramework:
-    def __init__(self, rules):
+    # spill: a storage.SpillStore to keep the arguments on disk (memory-bounded mode);
+    # self.arguments is then a SpilledArguments view instead of a list
+    def __init__(self, rules, budget=None, spill=None):
         self.rules = rules
-        self.arguments = []
+        self.spill = spill
+        # Integer id of each rule (its first position in self.rules)
+        self.rule_ids = {}
+        for rule_id, rule in enumerate(rules):
+            self.rule_ids.setdefault(rule, rule_id)
+        self.arena = ArgumentArena(spill)
+        self.arguments = [] if spill is None else SpilledArguments(self, spill.cache_size)
         self.argument_by_conclusion = {}
+        # Reverse index: argument id -> arguments that use it directly as a sub-argument.
+        # Spilled frameworks build it as a CSR over argument ids when first needed instead.
+        self.parent_arguments = {}
+        self._parent_index = None
         self.argument_counter = 0
-        self.generate_all_arguments()
+        # False when the budget ran out before every argument was built
+        self.complete = True
+        self.generate_all_arguments(budget)
 
     #getter for the arguments
     def get_arguments(self):
         return self.arguments
 
-    def generate_all_arguments(self):
+    def generate_all_arguments(self, budget=None):
         self.arguments.clear()
         self.argument_by_conclusion.clear()
+        self.parent_arguments.clear()
+        self._parent_index = None
+        self.arena = ArgumentArena(self.spill)
+        self.argument_counter = 0
+        self.complete = True
         self.initialize_arguments()
         changed = True
         while changed:
-            changed = self.combine_arguments()
+            changed = self.combine_arguments(budget)
+            if _should_stop(budget):
+                self.complete = False
+                break
 
 
     def initialize_arguments(self):
@@ -91,28 +445,52 @@ class ArgumentationFramework:
             if not rule.premises:
                 self.create_argument(rule, set())
 
+    def get_argument(self, argument_id):
+        return self.arguments[argument_id]
+
     def create_argument(self, rule, sub_arguments):
+        sub_ids = [sub_arg.id for sub_arg in sub_arguments]
+        existing_id = self.arena.find(self.rule_ids[rule], sub_ids)
+        if existing_id is not None:
+            # Same top rule over the same sub-arguments (e.g. a fact listed twice)
+            return self.arguments[existing_id]
         # Ensure unique names for each argument
         self.argument_counter += 1
         argument_name = f'A{self.argument_counter}'
-        new_argument = Argument(rule, sub_arguments, argument_name)
+        argument_id = self.arena.add(self.rule_ids[rule], sub_ids)
+        new_argument = Argument(rule, argument_name, argument_id, self)
+        if self.spill is not None:
+            self.arguments.remember(new_argument)
+            self.argument_by_conclusion.setdefault(rule.conclusion, ArgumentIds(self.arguments)).append(new_argument)
+            return new_argument
         self.arguments.append(new_argument)
         # Group arguments by their conclusion for easier access
         self.argument_by_conclusion.setdefault(rule.conclusion, []).append(new_argument)
+        # Register the new argument as a parent of each of its direct sub-arguments
+        for sub_id in self.arena.sub_argument_ids(argument_id):
+            self.parent_arguments.setdefault(sub_id, []).append(new_argument)
+        return new_argument
 
-    def combine_arguments(self):
+    def attack_list(self, name):
+        # Container for a list of attacks: a plain list, or an AttackStore on disk when spilled
+        return [] if self.spill is None else AttackStore(self.spill, self.arguments, name)
+
+    def combine_arguments(self, budget=None):
         new_arguments_formed = False
         for rule in self.rules:
             if rule.premises:
                 # Generate all possible combinations of existing arguments that match the premises
                 possible_combinations = [self.argument_by_conclusion.get(p, []) for p in rule.premises]
                 for combo in itertools.product(*possible_combinations):
+                    if _should_stop(budget):
+                        return new_arguments_formed
                     if self.validate_combination(rule, combo):
                         sub_arguments = frozenset(combo)
                         # Ensure no duplicate arguments with the same premises and top rule
-                        if not any(arg.sub_arguments == sub_arguments and arg.top_rule == rule for arg in self.arguments):
+                        if self.arena.find(self.rule_ids[rule], [arg.id for arg in sub_arguments]) is None:
                             self.create_argument(rule, sub_arguments)
                             new_arguments_formed = True
+                _report(budget, 'arguments', len(self.arguments))
         return new_arguments_formed
 
     def validate_combination(self, rule, combination):
@@ -169,36 +547,62 @@ class ArgumentationFramework:
         return last_defeasible_rules
     
     def get_sub_arguments(self, argument):
-        sub_arguments = set()
-        visited_arguments = set()
-
-        def dfs(arg):
-            visited_arguments.add(arg)
-            sub_arguments.add(arg)
-            for sub_arg in arg.sub_arguments:
-                if sub_arg not in visited_arguments:
-                    dfs(sub_arg)
-
-        dfs(argument)
-        return sub_arguments
-
-    def detect_undercuts(self):
-        undercuts = []
+        # The argument and all its sub-arguments, read from the arena's closure
+        return {self.arguments[i] for i in self.arena.closure_ids(argument.id)}
+
+    def argument_depth(self, argument):
+        return self.arena.depths[argument.id]
+
+    def parents_of(self, argument):
+        # Arguments that use 'argument' directly as a sub-argument
+        if self.spill is None:
+            return self.parent_arguments.get(argument.id, ())
+        if self._parent_index is None or len(self._parent_index[0]) != len(self.arena) + 1:
+            self._parent_index = self.arena.parent_index()
+        offsets, parent_ids = self._parent_index
+        return [self.arguments[i] for i in parent_ids[offsets[argument.id]:offsets[argument.id + 1]]]
+
+    def uses_rule(self, argument, rule):
+        rule_id = self.rule_ids.get(rule)
+        return rule_id is not None and self.arena.uses_rule_id(argument.id, rule_id)
+
+    def rules_used(self, argument):
+        return [self.rules[i] for i in self.arena.rule_ids_used(argument.id)]
+
+    def defeasible_rules_used(self, argument):
+        return [rule for rule in self.rules_used(argument) if rule.is_defeasible]
+
+    def premises_used(self, argument):
+        # The fact arguments the argument is built from
+        return [self.arguments[i] for i in self.arena.premise_ids(argument.id)]
+
+    def get_super_arguments(self, argument):
+        # Breadth-first walk over the parent index: every argument built on 'argument'
+        # (the argument itself included), each visited once
+        chain = [argument]
+        visited = {argument.id}
+        i = 0
+        while i < len(chain):
+            for parent in self.parents_of(chain[i]):
+                if parent.id not in visited:
+                    visited.add(parent.id)
+                    chain.append(parent)
+            i += 1
+        return chain
+
+    def detect_undercuts(self, budget=None):
+        undercuts = self.attack_list('undercuts')
         rule_to_arguments = {}
         negated_rules_to_arguments = {}
 
-        # Function to recursively check if an argument uses a specific rule
-        def uses_rule(arg, rule_ref):
-            if arg.top_rule.reference == rule_ref:
-                return True
-            return any(uses_rule(sub_arg, rule_ref) for sub_arg in arg.sub_arguments)
-
-        # Map arguments to rules they directly or indirectly use
-        for arg in self.arguments:
-            for rule in self.rules:
-                if uses_rule(arg, rule.reference):
-                    rule_to_arguments.setdefault(rule.reference, []).append(arg)
-                    #print(f"Rule {rule.reference} directly or indirectly used by argument {arg.name}")
+        # Map arguments to rules they directly or indirectly use (the arena keeps the set of
+        # rules used by every argument, so this only visits the rules actually used)
+        for done, arg in enumerate(self.arguments):
+            if _should_stop(budget):
+                return undercuts
+            _report(budget, 'attacks', done, len(self.arguments))
+            for reference in {self.rules[i].reference for i in self.arena.rule_ids_used(arg.id)}:
+                rule_to_arguments.setdefault(reference, []).append(arg)
 
         # Map negations directly mentioned in conclusions to arguments
         for arg in self.arguments:
@@ -233,13 +637,8 @@ class ArgumentationFramework:
 
 
     def is_sub_argument(self, arg, possible_parent):
-        # Check if 'arg' is a sub-argument of 'possible_parent', recursively
-        if arg in possible_parent.sub_arguments:
-            return True
-        for sub_arg in possible_parent.sub_arguments:
-            if self.is_sub_argument(arg, sub_arg):
-                return True
-        return False
+        # Check if 'arg' is a (direct or indirect) sub-argument of 'possible_parent'
+        return arg.id != possible_parent.id and self.arena.contains(possible_parent.id, arg.id)
     
     def print_rebuttals(self, rebuttals_by_conclusion):
         print("Rebuttals:")
@@ -264,42 +663,48 @@ class ArgumentationFramework:
         # Get all attacks, which are undercuts and rebuttals in your framework
         undercuts = self.detect_undercuts()
         rebuttals = self.detect_rebuttals()
-        attacks = undercuts + [rebuttal for conclusions in rebuttals.values() for rebuttal in conclusions]
+        attacks = list(undercuts) + [rebuttal for conclusions in rebuttals.values() for rebuttal in conclusions]
         return attacks
 
-    def compute_burdens_with_defeats(self, defeats, max_depth):
-        arguments = [arg.name for arg in self.arguments]
-        
-        # Create a dictionary to keep track of which arguments are defeated
-        defeated_args = {defeat[1].name for defeat in defeats}
-        
-        # Attacks dictionary initialization considering the defeats
-        attacks = {}
-        for arg in self.arguments:
-            # Exclude attacks from arguments that are defeated
-            attacks[arg.name] = [attacker.name for attacker, attacked in self.get_attacks()
-                                if attacked.name == arg.name and attacker.name not in defeated_args]
-
-        # Initial burdens calculation at depth 0 for all arguments
-        burdens = {(arg, 0): 1 for arg in arguments}
+    def compute_burdens_with_defeats(self, defeats, max_depth, attacks=None, budget=None):
+        # Burden numbers over argument ids: Bur_0(a) = 1 and, for an argument that is not
+        # defeated, Bur_i(a) = 1 + the sum of 1 / Bur_i-1(b) over the attackers b of a that
+        # are not defeated themselves; defeated arguments get infinity beyond depth 0.
+        # The attacks are streamed into a CSR of attacker ids per target (spilled when the
+        # framework is) instead of lists of pairs, so the memory used here grows with the
+        # number of arguments, plus 4 bytes per attack when not spilled.
+        # (the attacks don't depend on the defeats, callers may pass them in to reuse them)
+        if attacks is None:
+            attacks = self.get_attacks()
+        n = len(self.arena)
+        burdens = np.ones((max_depth + 1, n))
+        # If the budget runs out, the burden numbers stop at the last finished depth (depth 0
+        # when it runs out while the attacks are still being read)
+        defeated = np.zeros(n, dtype=bool)
+        index = None
+        for _, target_ids in iter_attack_id_chunks(defeats):
+            if _should_stop(budget):
+                break
+            defeated[target_ids] = True
+        else:
+            index = attacker_index(attacks, n, self.spill, budget)
+        if index is None:
+            max_depth = 0
+        else:
+            offsets, attacker_ids = index
 
-        # Defeated arguments should not have their burdens calculated beyond depth 0
-        for arg in defeated_args:
-            for depth in range(1, max_depth + 1):
-                burdens[(arg, depth)] = float('inf')  # Assigning 'infinity' to defeated arguments
-        
-        # Now calculate burdens for non-defeated arguments
         for depth in range(1, max_depth + 1):
-            for arg in arguments:
-                if arg not in defeated_args:
-                    # Sum of the inverse of burdens of attackers at previous depth
-                    burdens[(arg, depth)] = 1 + sum(1 / burdens[(attacker, depth - 1)] for attacker in attacks[arg])
-
-        # Extracting burden numbers for each argument up to the specified depth
-        burden_numbers = {arg: [burdens[(arg, depth)] for depth in range(max_depth + 1)]
-                        for arg in arguments}
+            if _should_stop(budget):
+                max_depth = depth - 1
+                break
+            _report(budget, 'burdens', depth - 1, max_depth)
+            # What each argument adds to the burden of the arguments it attacks
+            weights = np.where(defeated, 0.0, 1.0 / burdens[depth - 1])
+            burdens[depth] = np.where(defeated, np.inf, 1.0 + _segment_sums(offsets, attacker_ids, weights))
 
-        return burden_numbers
+        names = [arg.name for arg in self.arguments]
+        columns = burdens[:max_depth + 1].T.tolist()
+        return dict(zip(names, columns))
 
     def rank_arguments_with_defeats(self, burden_numbers):
         # Sort the arguments lexicographically by burden numbers
@@ -308,40 +713,154 @@ class ArgumentationFramework:
     
     # compare arguments given preferences between arguments and principles
 
-class ArgumentComparator:
-    @staticmethod
-    def compare_arguments_with_preferences(arguments):
-        # Création d'un dictionnaire pour stocker la force de chaque argument
-        argument_strengths = {}
-        
-        # Parcours de tous les arguments
-        for arg in arguments:
-            # Initialisation de la force de l'argument
-            argument_strength = 0
-            
-            # Ignorer le poids des règles dans un contexte démocratique
-            
-            # Parcours des attaques subies par l'argument
-            for attack in arg.attacks:
-                # Calcul de la force de l'attaque (ignore le poids de la règle)
-                attack_strength = 1  # Toutes les attaques ont la même force dans un cadre démocratique
-                
-                # Comparaison de la force de l'attaque avec la force actuelle de l'argument
-                if attack_strength > argument_strength:
-                    argument_strength = attack_strength  # Mise à jour de la force de l'argument si nécessaire
-            
-            # Stockage de la force finale de l'argument dans le dictionnaire
-            argument_strengths[arg] = argument_strength
-        
-        # Tri des arguments selon leur force, du plus fort au plus faible
-        sorted_arguments = sorted(argument_strengths.items(), key=lambda x: x[1], reverse=True)
-        
-        # Retourner les arguments triés
-        return sorted_arguments
-
-
+def iter_attack_id_chunks(attacks, chunk_size=1 << 16):
+    # (attacker ids, target ids) NumPy arrays of at most chunk_size attacks. Attack stores,
+    # factorized blocks and AttackChains produce them directly; plain pair lists are read
+    # chunk_size pairs at a time.
+    if hasattr(attacks, 'iter_id_chunks'):
+        yield from attacks.iter_id_chunks(chunk_size)
+        return
+    pairs = iter(attacks)
+    while True:
+        chunk = list(itertools.islice(pairs, chunk_size))
+        if not chunk:
+            return
+        yield (np.fromiter((attacker.id for attacker, _ in chunk), dtype=np.intp, count=len(chunk)),
+               np.fromiter((attacked.id for _, attacked in chunk), dtype=np.intp, count=len(chunk)))
+
+
+def attacker_index(attacks, n, spill=None, budget=None):
+    # CSR of the attackers of every argument, built in two streaming passes over the
+    # attacks (count, then fill): attacker_ids[offsets[i]:offsets[i + 1]] are the ids of
+    # the arguments attacking argument i, in attack order. With a storage.SpillStore the
+    # attacker ids are a file-backed array. Returns None if the budget runs out first.
+    counts = np.zeros(n, dtype=np.int64)
+    done = 0
+    for _, target_ids in iter_attack_id_chunks(attacks):
+        if _should_stop(budget):
+            return None
+        counts += np.bincount(target_ids, minlength=n)
+        done += len(target_ids)
+        _report(budget, 'burdens', done)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    total = int(offsets[-1])
+    attacker_ids = np.empty(total, dtype=np.int32) if spill is None else spill.array('attackers', np.int32, total)
+    cursor = offsets[:-1].copy()
+    done = 0
+    for source_ids, target_ids in iter_attack_id_chunks(attacks):
+        if _should_stop(budget):
+            return None
+        order = np.argsort(target_ids, kind='stable')
+        sorted_targets = target_ids[order]
+        # Position of each attack among the chunk's attacks on the same target
+        group_starts = np.flatnonzero(np.r_[True, sorted_targets[1:] != sorted_targets[:-1]])
+        rank = np.arange(len(order)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(order)]))
+        attacker_ids[cursor[sorted_targets] + rank] = source_ids[order]
+        cursor += np.bincount(target_ids, minlength=n)
+        done += len(target_ids)
+        _report(budget, 'burdens', done, total)
+    return offsets, attacker_ids
+
+
+def _segment_sums(offsets, ids, weights, chunk_size=1 << 16):
+    # For every argument i, the sum of weights[ids[offsets[i]:offsets[i + 1]]], reading the
+    # ids about chunk_size at a time
+    n = len(offsets) - 1
+    sums = np.zeros(n)
+    first = 0
+    while first < n:
+        last = int(np.searchsorted(offsets, offsets[first] + chunk_size, side='right')) - 1
+        last = min(max(last, first + 1), n)
+        starts = offsets[first:last] - offsets[first]
+        gathered = weights[np.asarray(ids[offsets[first]:offsets[last]])]
+        nonempty = offsets[first + 1:last + 1] > offsets[first:last]
+        if gathered.size:
+            sums[first:last][nonempty] = np.add.reduceat(gathered, starts[nonempty])
+        first = last
+    return sums
+
+
+class AttackChain:
+    # Several attack relations (pair lists, AttackStores, FactorizedAttacks) read as one;
+    # unlike itertools.chain it can be iterated again
+    def __init__(self, *relations):
+        self.relations = relations
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.relations)
+
+    def __len__(self):
+        return sum(len(relation) for relation in self.relations)
+
+    def iter_id_chunks(self, chunk_size=1 << 16):
+        for relation in self.relations:
+            yield from iter_attack_id_chunks(relation, chunk_size)
+
+
+def _incoming_index(pairs, position, n):
+    # CSR of the incoming edges of every argument: sources[offsets[i]:offsets[i + 1]] are the
+    # positions of the arguments attacking argument i
+    edges = np.fromiter(itertools.chain.from_iterable((position[attacker.name], position[attacked.name])
+                                                      for attacker, attacked in pairs), dtype=np.intp)
+    sources, targets = edges[0::2], edges[1::2]
+    order = np.argsort(targets, kind='stable')
+    offsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(targets, minlength=n), out=offsets[1:])
+    return offsets, sources[order]
 
 
+class ArgumentComparator:
+    # Democratic comparison: every attack counts the same and rule weights are ignored.
+    # An argument is stronger the fewer arguments defeat it, and among arguments with as
+    # many defeaters, the fewer attack it:  strength = 1 / (1 + defeaters).
+    # The attacker and defeater indexes are built once; strengths for all arguments are
+    # computed in one vectorized pass, and top-k queries use a heap instead of a full sort.
+    def __init__(self, arguments, attacks=(), defeats=()):
+        self.arguments = list(arguments)
+        n = len(self.arguments)
+        self.position = {arg.name: i for i, arg in enumerate(self.arguments)}
+        self.attacker_offsets, self.attacker_ids = _incoming_index(attacks, self.position, n)
+        self.defeater_offsets, self.defeater_ids = _incoming_index(defeats, self.position, n)
+        self.attacker_counts = np.diff(self.attacker_offsets)
+        self.defeater_counts = np.diff(self.defeater_offsets)
+        self.strengths = 1.0 / (1.0 + self.defeater_counts)
+        # Sort keys, larger is stronger
+        self._keys = list(zip(self.strengths.tolist(), (-self.attacker_counts).tolist()))
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        return cls(analysis.af.get_arguments(), analysis.attacks(), analysis.defeats)
+
+    def attackers_of(self, argument):
+        i = self.position[argument.name]
+        return [self.arguments[j] for j in self.attacker_ids[self.attacker_offsets[i]:self.attacker_offsets[i + 1]]]
+
+    def defeaters_of(self, argument):
+        i = self.position[argument.name]
+        return [self.arguments[j] for j in self.defeater_ids[self.defeater_offsets[i]:self.defeater_offsets[i + 1]]]
+
+    def strength(self, argument):
+        return self._keys[self.position[argument.name]][0]
+
+    def compare(self, first, second):
+        # 1 if 'first' is stronger, -1 if 'second' is, 0 if they are as strong
+        first_key = self._keys[self.position[first.name]]
+        second_key = self._keys[self.position[second.name]]
+        return (first_key > second_key) - (first_key < second_key)
+
+    def strongest(self, k):
+        # The k strongest arguments as (argument, strength) pairs, ties in argument order
+        top = heapq.nlargest(k, range(len(self.arguments)), key=self._keys.__getitem__)
+        return [(self.arguments[i], self._keys[i][0]) for i in top]
+
+    def weakest(self, k):
+        bottom = heapq.nsmallest(k, range(len(self.arguments)), key=self._keys.__getitem__)
+        return [(self.arguments[i], self._keys[i][0]) for i in bottom]
+
+    def compare_arguments_with_preferences(self):
+        # Every argument with its strength, strongest first
+        return self.strongest(len(self.arguments))
 
 
 # Function to create contrapositions for strict rules
@@ -380,28 +899,29 @@ def create_contrapositions(strict_rules, num_rules):
 
 
 
+# Example rule base (tuples, so that no caller can mutate the shared example)
 # Define strict rules
-strict_rules = [
+strict_rules = (
     Rule([], Literal('a'), reference='r1'),              
     Rule([Literal('b'), Literal('d')], Literal('c'), reference='r2'),
     Rule([Literal('c', is_negative=True)], Literal('d'), reference='r3')
-]
+)
 
 # Define defeasible rules
-defeasible_rules = [
+defeasible_rules = (
     Rule([Literal('a')], Literal('d', is_negative=True), is_defeasible=True, reference='r4'),
     Rule([], Literal('b'), is_defeasible=True, reference='r5',rule_weight=1),
     Rule([], Literal('c', is_negative=True), is_defeasible=True, reference='r6',rule_weight=1),
     Rule([], Literal('d'), is_defeasible=True, reference='r7'),
     Rule([Literal('c')], Literal('e'), is_defeasible=True, reference='r8'),
     Rule([Literal('c', is_negative=True)], Literal('r4', is_negative=True), is_defeasible=True, reference='r9')
-]
+)
 
 rules = strict_rules + defeasible_rules
 
 # Print the rules and their contrapositions
 
-contraposition_rules = create_contrapositions(strict_rules, len(strict_rules) + len(defeasible_rules))
+contraposition_rules = tuple(create_contrapositions(strict_rules, len(strict_rules) + len(defeasible_rules)))
 
 # # Examples based on the provided information
 # a = Literal('a')
@@ -447,8 +967,7 @@ contraposition_rules = create_contrapositions(strict_rules, len(strict_rules) +
 # Combine original and contraposition rules with defeasible rules
 all_rules = strict_rules + contraposition_rules + defeasible_rules
 
-# Now you create the ArgumentationFramework with all the rules
-af = ArgumentationFramework(all_rules)
+# The framework and everything derived from it is built per call by analyze() below
 
 # Step 3: Generate and Combine Arguments
 #af.generate_all_arguments()
@@ -517,8 +1036,6 @@ af = ArgumentationFramework(all_rules)
 #     print(f"{undercut[0]} undercuts {undercut[1]}")
 # Now call the methods to detect undercuts and rebuttals
 
-undercuts = af.detect_undercuts()
-rebuttals = af.detect_rebuttals()
 
 #Expecting 
     # (A6,A7)
@@ -527,30 +1044,15 @@ rebuttals = af.detect_rebuttals()
 
 
 
-def generate_argument_chain(argument_set, starting_argument):
-    argument_chain = [starting_argument]  # Initialize a list with the starting argument
-    addedSomething = True
-    while addedSomething:
-        for arg in argument_set:
-            for argchain in argument_chain:
-                if argchain in arg.sub_arguments:
-                    argument_chain.append(arg)
-                else:
-                    addedSomething = False
-   
-    argument_chain = list(set(argument_chain))
-    return argument_chain
-args = af.get_arguments()
-conclusions = [arg.top_rule.conclusion for arg in args]
-conclusions = list(set(conclusions))
-conclusion_Args = {}
-
-for conclusion in conclusions:
-    conclusion_Args[conclusion] = [arg.name for arg in args if arg.top_rule.conclusion == conclusion]
+def conclusion_arguments(arguments):
+    conclusion_Args = {}
+    for arg in arguments:
+        conclusion_Args.setdefault(arg.top_rule.conclusion, []).append(arg.name)
+    return conclusion_Args
 
 
 def find_contrary_literals(arguments):
-    conclusions = [arg.top_rule.conclusion for arg in arguments]
+    conclusions = {arg.top_rule.conclusion for arg in arguments}
     contrary_literals = []
     for conclusion in conclusions:
         literal_name = conclusion.name
@@ -562,45 +1064,53 @@ def find_contrary_literals(arguments):
     contrary_literals = list(set(contrary_literals))
     return contrary_literals
 
-def find_rebuttal_attacks(arguments):
+def find_rebuttal_attacks(arguments, budget=None, restricted=False):
+    # restricted: only arguments with a defeasible top rule can be rebutted (ASPIC+
+    # restricted rebut); their super-arguments are added later by extend_argument_chains
     contrary_literals = find_contrary_literals(arguments)
     rebuttal_attacks = {}
     for literal in contrary_literals:
+        if _should_stop(budget):
+            break
         for arg in arguments:
+            if restricted and not arg.top_rule.is_defeasible:
+                continue
             if arg.top_rule.conclusion.name == literal.name and arg.top_rule.conclusion.is_negative != literal.is_negative:
                 if literal not in rebuttal_attacks:
                     rebuttal_attacks[literal] = []
                 rebuttal_attacks[literal].append(arg)
     return rebuttal_attacks
-rebuttal_attacks = find_rebuttal_attacks(args)
-for literal, arguments in rebuttal_attacks.items():
-    rebuttal_attacks[literal] = list(set(rebuttal_attacks[literal]))
 
-def find_sub_arguments( main_argument):
+def find_sub_arguments(main_argument, af=None):
+    # Every sub-argument of main_argument, once each. With the framework the arena's
+    # closure is read directly; otherwise shared sub-arguments are walked only once.
+    if af is not None:
+        return [af.arguments[i] for i in af.arena.closure_ids(main_argument.id) if i != main_argument.id]
     sub_arguments = []
-
-    def find_sub_arguments_recursive(argument):
-        for sub_arg in argument.sub_arguments:
-            sub_arguments.append(sub_arg)
-            find_sub_arguments_recursive(sub_arg)
-
-    find_sub_arguments_recursive(main_argument)
+    seen = set()
+    stack = [main_argument]
+    while stack:
+        for sub_arg in stack.pop().sub_arguments:
+            if sub_arg not in seen:
+                seen.add(sub_arg)
+                sub_arguments.append(sub_arg)
+                stack.append(sub_arg)
     return sub_arguments
 
-def extend_rebuttals_with_sub_arguments(rebuttal_attacks, all_arguments):
+def extend_rebuttals_with_sub_arguments(rebuttal_attacks, af):
     extended_rebuttals = rebuttal_attacks.copy()
     for literal, attacks in rebuttal_attacks.items():
         for arg in attacks:
-            found = generate_argument_chain(all_arguments, arg)
+            found = af.get_super_arguments(arg)
             extended_rebuttals[literal].extend(found)
     return extended_rebuttals
 
-def extend_rebuttals_with_sub_arguments1(rebuttal_attacks,all_arguments):
+def extend_rebuttals_with_sub_arguments1(rebuttal_attacks, af):
     extended_rebuttals = rebuttal_attacks.copy()
     for literal, attacks in rebuttal_attacks.items():
         for arg in attacks:
             # Find sub-arguments for the current argument
-            sub_arguments = generate_argument_chain(all_arguments,arg)
+            sub_arguments = af.get_super_arguments(arg)
             # Filter out sub-arguments with the same conclusion as the literal and different negation
             sub_arguments_filtered = []
             for sub_arg in sub_arguments:
@@ -610,10 +1120,6 @@ def extend_rebuttals_with_sub_arguments1(rebuttal_attacks,all_arguments):
             extended_rebuttals[literal].extend(sub_arguments_filtered)
     return extended_rebuttals
 
-extended_rebuttals = rebuttal_attacks
-# remove duplicate from each list 
-for literal, arguments in extended_rebuttals.items():
-    extended_rebuttals[literal] = list(set(arguments))
 #for literal, arguments in extended_rebuttals.items():
 #    print(f"Rebuttal attacks against {literal}:")
 #    for arg in arguments:
@@ -637,7 +1143,141 @@ def tuple_of_rubutlals(rebuttal_attacks,args):
 
     return rebuttal_tuples
 #rebuttal_tuples = tuple_of_rubutlals(extended_rebuttals,args)
-total = 0
+
+class AttackBlock:
+    # Every argument in 'attackers' attacks every argument in 'targets'
+    def __init__(self, label, attackers, targets):
+        self.label = label
+        # Dedup by argument id, keeping the first-seen order
+        self.attackers = tuple({arg.id: arg for arg in attackers}.values())
+        self.targets = tuple({arg.id: arg for arg in targets}.values())
+        self.attacker_ids = frozenset(arg.id for arg in self.attackers)
+        self.target_ids = frozenset(arg.id for arg in self.targets)
+
+    def __repr__(self):
+        attackers_str = ', '.join(arg.name for arg in self.attackers)
+        targets_str = ', '.join(arg.name for arg in self.targets)
+        return f"{self.label}: {{{attackers_str}}} x {{{targets_str}}}"
+
+    def __len__(self):
+        return len(self.attackers) * len(self.targets)
+
+    def __contains__(self, attack):
+        attacker, attacked = attack
+        return attacker.id in self.attacker_ids and attacked.id in self.target_ids
+
+    def __iter__(self):
+        return itertools.product(self.attackers, self.targets)
+
+
+class FactorizedAttacks:
+    # Attacks stored as (attacker group, target group) blocks; pairs are only expanded on demand
+    def __init__(self, blocks=()):
+        self.blocks = list(blocks)
+
+    def add_block(self, label, attackers, targets):
+        block = AttackBlock(label, attackers, targets)
+        if len(block):
+            self.blocks.append(block)
+        return block
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+    def count(self):
+        return len(self)
+
+    def __contains__(self, attack):
+        return any(attack in block for block in self.blocks)
+
+    def __iter__(self):
+        # Lazily expand every block into (attacker, attacked) pairs
+        return itertools.chain.from_iterable(self.blocks)
+
+    def iter_id_chunks(self, chunk_size=1 << 16):
+        # Blocks expanded into (attacker ids, target ids) arrays, a few attackers at a time,
+        # in the same order as iterating the pairs
+        for block in self.blocks:
+            attacker_ids = np.fromiter((arg.id for arg in block.attackers), dtype=np.intp, count=len(block.attackers))
+            target_ids = np.fromiter((arg.id for arg in block.targets), dtype=np.intp, count=len(block.targets))
+            rows = max(1, chunk_size // len(target_ids))
+            for start in range(0, len(attacker_ids), rows):
+                chunk = attacker_ids[start:start + rows]
+                yield np.repeat(chunk, len(target_ids)), np.tile(target_ids, len(chunk))
+
+    def blocks_by_label(self):
+        grouped = {}
+        for block in self.blocks:
+            grouped.setdefault(block.label, []).append(block)
+        return grouped
+
+    def attackers_of(self, argument):
+        attackers = {}
+        for block in self.blocks:
+            if argument.id in block.target_ids:
+                attackers.update((arg.id, arg) for arg in block.attackers)
+        return list(attackers.values())
+
+    def targets_of(self, argument):
+        targets = {}
+        for block in self.blocks:
+            if argument.id in block.attacker_ids:
+                targets.update((arg.id, arg) for arg in block.targets)
+        return list(targets.values())
+
+    def _block_defeats(self, af, block, rules_cache):
+        # Split the block into attacker/target weight profiles instead of testing every pair
+        def rules_of(arg):
+            if arg.id not in rules_cache:
+                rules_cache[arg.id] = af.get_defeasible_rules_for_argument(arg)
+            return rules_cache[arg.id]
+
+        # Targets without defeasible rules can only be defeated by attackers without any either
+        target_weights = []
+        for target in block.targets:
+            target_rules = rules_of(target)
+            if target_rules:
+                target_weights.append((min(rule.rule_weight for rule in target_rules), target))
+        target_weights.sort(key=itemgetter(0))
+        sorted_weights = [weight for weight, _ in target_weights]
+
+        for attacker in block.attackers:
+            attacker_rules = rules_of(attacker)
+            if not attacker_rules:
+                yield attacker, block.targets
+            else:
+                strongest = max(rule.rule_weight for rule in attacker_rules)
+                cut = bisect.bisect_right(sorted_weights, strongest)
+                yield attacker, [target for _, target in target_weights[:cut]]
+
+    def count_defeats(self, af):
+        rules_cache = {}
+        return sum(len(targets) for block in self.blocks
+                   for _, targets in self._block_defeats(af, block, rules_cache))
+
+    def iter_defeats(self, af, budget=None):
+        rules_cache = {}
+        for done, block in enumerate(self.blocks):
+            if _should_stop(budget):
+                return
+            _report(budget, 'defeats', done, len(self.blocks))
+            for attacker, targets in self._block_defeats(af, block, rules_cache):
+                for target in targets:
+                    yield attacker, target
+
+    def is_defeat(self, af, attack):
+        attacker, attacked = attack
+        return attack in self and attack_succeeds(af.get_defeasible_rules_for_argument(attacker),
+                                                  af.get_defeasible_rules_for_argument(attacked))
+
+
+def factorize_rebuttals(rebuttal_attacks, af):
+    # Same attacks as tuple_of_rubutlals (without its repeated pairs), kept as one block per
+    # literal instead of a pair list
+    factorized = FactorizedAttacks()
+    for literal, attacks in rebuttal_attacks.items():
+        factorized.add_block(literal, af.argument_by_conclusion.get(literal, []), attacks)
+    return factorized
 
 def delete_arguments_with_same_conclusion(rebuttal_attacks={}):
     for literal, attacks in rebuttal_attacks.items():
@@ -649,32 +1289,29 @@ def delete_arguments_with_same_conclusion(rebuttal_attacks={}):
                 # Remove the argument from the list
                 attacks.remove(arg)
 #delete_arguments_with_same_conclusion(extended_rebuttals)
-saved_rebuttal = find_rebuttal_attacks(args)
 
 
 
 
-def extend_argument_chains(argument_set, argument_dict):
+def extend_argument_chains(af, argument_dict, budget=None):
     extended_argument_dict = {}  # Initialize a new dictionary to store extended argument chains
     for literal, arguments in argument_dict.items():
+        if _should_stop(budget):
+            break
         extended_argument_list = []  # Initialize a list to store extended argument chains for the current literal
         for arg in arguments:
-            # Generate the argument chain starting from the current argument
-            argument_chain = generate_argument_chain(argument_set, arg)
+            # All arguments built on the current argument, read from the framework's parent index
+            argument_chain = af.get_super_arguments(arg)
             extended_argument_list.extend(argument_chain)  # Extend the list with the generated argument chain
         # Add the extended argument list to the dictionary with the same key
         extended_argument_dict[literal] = extended_argument_list
     return extended_argument_dict
 
-# Extend the rebuttal attacks with sub-arguments
-ext_rebuttals = extend_argument_chains(args, rebuttal_attacks)
-
 #for literal, arguments in ext_rebuttals.items():
 #    print(f"Rebuttal attacks against {literal}:")
 #    print(rebuttal_attacks[literal])
 #    print("Extended:")
 #    print(ext_rebuttals[literal])
-final_tuple = tuple_of_rubutlals(ext_rebuttals,args)
 #print(final_tuple)
 
 
@@ -697,8 +1334,6 @@ def find_defeasible_rules_for_undercuts_attack(undercuts, af):
                 defeasible_rules_for_undercuts[arg] = defeasible_rules
     return defeasible_rules_for_undercuts
 
-# Find defeasible rules for attacks
-defeasible_rules_for_rebuttal_attacks = find_defeasible_rules_for_rebuttal_attacks(rebuttal_attacks, af)
 #defeasible_rules_for_undercuts = find_defeasible_rules_for_undercuts_attack(undercuts, af)
 # Undercuts renvoie une chaine de caractere il faut des tuples pour simplifier je vais donc essayer de le faire avec rebuts
 
@@ -727,7 +1362,7 @@ def weakest(rule_set1, rule_set2):
 
 
 # fonction qui loop sur tous les tuples de rebutts puis cherche les membres defeasible de ces derniers puis les donne en parametre a la fonction weakest, elle devra renvoyer les defeats 
-def find_defeats(defeasible_rules_for_rebuttal_attacks):
+def find_defeats(af, defeasible_rules_for_rebuttal_attacks):
     defeats = {}
     for arg, defeasible_rules in defeasible_rules_for_rebuttal_attacks.items():
         for rule in defeasible_rules:
@@ -736,124 +1371,363 @@ def find_defeats(defeasible_rules_for_rebuttal_attacks):
     return defeats
 
 
-# regroupe all the attacks into one array 
-attacks = undercuts
-for key,value in final_tuple.items():
-    attacks.extend(value)
+def rule_weight(rule, weights=None):
+    # 'weights' optionally overrides rule weights by rule reference
+    if weights is None:
+        return rule.rule_weight
+    return weights.get(rule.reference, rule.rule_weight)
 
+def attack_succeeds(attacker_rules, attacked_rules, weights=None):
+    # An attack becomes a defeat when the attacker has no defeasible rule, or when one of
+    # its defeasible rules weighs at least as much as one of the attacked argument's rules
+    if not attacker_rules:
+        return True
+    if not attacked_rules:
+        return False
+    return max(rule_weight(rule, weights) for rule in attacker_rules) >= \
+        min(rule_weight(rule, weights) for rule in attacked_rules)
 
-def find_defeated(attacks):
+def find_defeated(af, attacks, weights=None, budget=None):
     defeats =[]
     for attack in attacks:
+        if _should_stop(budget):
+            break
         attacker = attack[0]
         attacked = attack[1]
         # get defeasible rule for each 
         attacker_Def = af.get_defeasible_rules_for_argument(attacker)
         attacked_Def = af.get_defeasible_rules_for_argument(attacked)
-        if not attacker_Def:
-            defeats.append(attack)
-        else :
-            for rule in attacker_Def:
-                is_preferred = False
-                for defence_rule in attacked_Def:
-                    if rule.rule_weight >= defence_rule.rule_weight:
-                        is_preferred = True
-                        break
-        if is_preferred:
+        if attack_succeeds(attacker_Def, attacked_Def, weights):
             defeats.append(attack)
     return defeats
                 
             
 def generate_histogram(defeats):
     # Calculate in-degree for each argument (number of times it is defeated)
-    in_degree_count = {}
-    for attack in defeats:
-        attacked = attack[1]  # Assuming the second element of the tuple is the attacked argument
-        if attacked.name not in in_degree_count:
-            in_degree_count[attacked.name] = 0
-        in_degree_count[attacked.name] += 1
-
-    # Create a histogram data, where keys are in-degree and values are counts of arguments
-    histogram_data = {}
-    for count in in_degree_count.values():
-        if count not in histogram_data:
-            histogram_data[count] = 0
-        histogram_data[count] += 1
-
-    # Data for plotting
-    x = list(histogram_data.keys())
-    y = [histogram_data[count] for count in x]
-
-    plt.bar(x, y, color='blue')
-    plt.xlabel('Defeat In-Degree')
-    plt.ylabel('Number of Arguments')
-    plt.title('Histogram of Argument Defeat In-Degree')
-
-    # Show the plot
-    #plt.show()
-    return plt
-
-# def create_argument_graph(arguments, attacks):
-#     # Create a directed graph
-#     G = nx.DiGraph()
-    
-#     # Map each unique conclusion to a list of arguments having that conclusion
-#     conclusion_to_args = {}
-#     for arg in arguments:
-#         conclusion = str(arg.top_rule.conclusion)
-#         if conclusion not in conclusion_to_args:
-#             conclusion_to_args[conclusion] = []
-#         conclusion_to_args[conclusion].append(arg.name)
-    
-#     # Add nodes (each unique conclusion is a node)
-#     for conclusion, args in conclusion_to_args.items():
-#         label = conclusion + '\n' + ', '.join(args)
-#         G.add_node(conclusion, label=label)
-    
-#     # Add edges (each attack is a directed edge towards conclusions)
-#     seen_attacks = set()
-#     for attacker, attacked in attacks:
-#         attacker_conclusion = str(attacker.top_rule.conclusion)
-#         attacked_conclusion = str(attacked.top_rule.conclusion)
-#         attack_tuple = (attacker_conclusion, attacked_conclusion)
-#         if attack_tuple not in seen_attacks:
-#             G.add_edge(attacker_conclusion, attacked_conclusion)
-#             seen_attacks.add(attack_tuple)
-
-#     # Draw the graph
-#     pos = nx.spring_layout(G)  # positions for all nodes
-#     labels = nx.get_node_attributes(G, 'label')
-
-#     nx.draw(G, pos, with_labels=True, labels=labels, node_size=2000, node_color='lightblue', 
-#             linewidths=0.25, font_size=10, font_weight='bold', arrowsize=20)
-    
-#     plt.show()
-
-
-
-
-
-
-defeats = find_defeated(attacks)
-generate_histogram(defeats)
-# create_argument_graph(args, attacks)
-
-burden_numbers = af.compute_burdens_with_defeats(defeats, max_depth=3)
-ranked_arguments = af.rank_arguments_with_defeats(burden_numbers)
-#for arg in ranked_arguments:
-#    print(f"Argument: {arg}, Burden: {burden_numbers[arg]}")
+    in_degree_count = Counter(attacked.name for _, attacked in defeats)
+
+    # Number of arguments for every in-degree, from 1 to the largest one
+    counts = np.fromiter(in_degree_count.values(), dtype=np.intp, count=len(in_degree_count))
+    histogram_data = np.bincount(counts) if len(counts) else np.zeros(1, dtype=np.intp)
+    x = np.flatnonzero(histogram_data)
+    y = histogram_data[x]
+
+    # A fresh standalone Figure on every call: not registered with pyplot, so nothing
+    # accumulates between calls and concurrent calls don't share state
+    fig = Figure()
+    ax = fig.subplots()
+    ax.bar(x, y, color='blue')
+    ax.set_xlabel('Defeat In-Degree')
+    ax.set_ylabel('Number of Arguments')
+    ax.set_title('Histogram of Argument Defeat In-Degree')
+    return fig
+
+GRAPH_COLLAPSE_MODES = (None, 'conclusion', 'scc')
+
+def _sample_edges(edges, max_edges, seed):
+    # Reservoir sample of at most max_edges edges from a stream of unknown length
+    rng = random.Random(seed)
+    sample = []
+    total = 0
+    for edge in edges:
+        total += 1
+        if len(sample) < max_edges:
+            sample.append(edge)
+        else:
+            slot = rng.randrange(total)
+            if slot < max_edges:
+                sample[slot] = edge
+    return sample, total
+
+def _graph_nodes(arguments, attacks, collapse):
+    # Maps every argument name to the node that represents it, and labels the nodes
+    if collapse is None:
+        node_of = {arg.name: arg.name for arg in arguments}
+    elif collapse == 'conclusion':
+        node_of = {arg.name: str(arg.top_rule.conclusion) for arg in arguments}
+    elif collapse == 'scc':
+        # Strongly connected components of the full attack graph
+        G = nx.DiGraph()
+        G.add_nodes_from(arg.name for arg in arguments)
+        G.add_edges_from((attacker.name, attacked.name) for attacker, attacked in attacks)
+        node_of = {}
+        for index, component in enumerate(nx.strongly_connected_components(G)):
+            for name in component:
+                node_of[name] = f'C{index + 1}'
+    else:
+        raise ValueError(f"unknown collapse mode {collapse!r}, expected one of {GRAPH_COLLAPSE_MODES}")
+    sizes = Counter(node_of.values())
+    return node_of, sizes
+
+def create_argument_graph(arguments, attacks, collapse=None, max_edges=2000, seed=0):
+    # Draws the attack graph and returns it as a standalone Figure (not registered with pyplot).
+    # collapse=None draws one node per argument, 'conclusion' one per conclusion and
+    # 'scc' one per strongly connected component. At most max_edges distinct edges are
+    # drawn: the heaviest ones when collapsing, a uniform sample otherwise.
+    arguments = list(arguments)
+    if collapse == 'scc':
+        attacks = list(attacks)
+    node_of, sizes = _graph_nodes(arguments, attacks, collapse)
+
+    if collapse is None:
+        sample, total = _sample_edges(((attacker.name, attacked.name) for attacker, attacked in attacks),
+                                      max_edges, seed)
+        edge_weights = Counter(sample)
+    else:
+        edge_weights = Counter()
+        total = 0
+        for attacker, attacked in attacks:
+            edge_weights[node_of[attacker.name], node_of[attacked.name]] += 1
+            total += 1
+        edge_weights = Counter(dict(edge_weights.most_common(max_edges)))
 
-def create_argument_graph(arguments, attacks):
     G = nx.DiGraph()
-    for arg in arguments:
-        G.add_node(arg.name, label=arg.name)
-    for attacker, attacked in attacks:
-        G.add_edge(attacker.name, attacked.name)
-    pos = nx.circular_layout(G)
+    for node, size in sizes.items():
+        G.add_node(node, label=node if collapse is None else f'{node} ({size})')
+    for (source, target), weight in edge_weights.items():
+        G.add_edge(source, target, weight=weight)
+
+    # Node size, labels and layout scale down with the number of nodes
+    n = G.number_of_nodes()
+    node_size = max(30, min(2000, 40000 // max(n, 1)))
+    show_labels = n <= 60
+    pos = nx.circular_layout(G)  # O(n); force-directed layouts don't scale to large frameworks
     labels = nx.get_node_attributes(G, 'label')
 
-    plt.figure(figsize=(8, 8))
-    nx.draw(G, pos, with_labels=True, labels=labels, node_size=2000, node_color='lightblue',
-            linewidths=0.25, font_size=10, font_weight='bold', arrowsize=20)
-    plt.show()
-    return plt
\ No newline at end of file
+    fig = Figure(figsize=(8, 8))
+    ax = fig.subplots()
+    ax.set_axis_off()
+    nx.draw_networkx(G, pos, ax=ax, with_labels=show_labels, labels=labels if show_labels else None,
+                     node_size=node_size, node_color='lightblue', linewidths=0.25, font_size=10,
+                     font_weight='bold', arrowsize=max(5, min(20, node_size // 100)),
+                     width=0.5 if n > 200 else 1.0)
+    ax.set_title(f'{n} nodes, {G.number_of_edges()} of {total} attacks shown')
+    return fig
+
+
+PIPELINE_STAGES = ('arguments', 'attacks', 'defeats', 'burdens')
+# 'unrestricted': rebut on any contrary conclusion, plus undercuts
+# 'restricted':   rebut only on sub-arguments with a defeasible top rule, plus undercuts
+# 'undercut':     undercuts only, no rebuttals are computed at all
+ATTACK_MODES = ('unrestricted', 'restricted', 'undercut')
+
+
+class Analysis:
+    # Everything computed for one rule base; nothing in here is shared with other analyses
+    # spill: a storage.SpillStore; arguments, undercuts and defeats are then kept on disk
+    # (see ArgumentationFramework) and stay readable until the store is closed
+    def __init__(self, rules, attack_mode='unrestricted', spill=None):
+        if attack_mode not in ATTACK_MODES:
+            raise ValueError(f"unknown attack mode {attack_mode!r}, expected one of {ATTACK_MODES}")
+        self.rules = list(rules)
+        self.attack_mode = attack_mode
+        self.spill = spill
+        self.contraposition_rules = []
+        self.af = None
+        self.undercuts = []
+        self.rebuttal_attacks = {}
+        self.extended_rebuttals = {}
+        self.rebuttals = FactorizedAttacks()
+        self.defeats = []
+        self.burden_numbers = {}
+        self.ranked_arguments = []
+        self.timings = {}  # seconds spent in each stage
+        # Stages that did not run to the end (the budget ran out or the run was cancelled);
+        # their results, and those of every later stage, are partial or empty
+        self.incomplete = list(PIPELINE_STAGES)
+
+    @property
+    def complete(self):
+        return not self.incomplete
+
+    def attacks(self):
+        # Undercuts followed by the expanded rebuttal pairs
+        return AttackChain(self.undercuts, self.rebuttals)
+
+    def count_attacks(self):
+        return len(self.undercuts) + len(self.rebuttals)
+
+    def burden_attacks(self):
+        # Attacks the burden numbers propagate along: the ones the 'attacks' stage computed,
+        # so the modes only differ in which rebuttals they find
+        return self.attacks()
+
+
+def analyze(rules, max_depth=3, budget=None, attack_mode='unrestricted', spill=None):
+    # Full pipeline for one rule base: contrapositions, arguments, attacks, defeats, burdens.
+    # With a Budget the pipeline is anytime: it returns whatever it had when the deadline
+    # passed or the budget was cancelled, with analysis.incomplete listing the cut stages.
+    analysis = Analysis(rules, attack_mode, spill)
+    run_analysis(analysis, max_depth, budget)
+    return analysis
+
+
+def run_analysis(analysis, max_depth=3, budget=None, stop_after=None):
+    # Fills in an Analysis stage by stage. Every stage stores its results on the analysis as
+    # soon as it has them, so a caller holding the object (e.g. another thread) sees the
+    # partial results even if the run is stopped half way. With stop_after (one of
+    # PIPELINE_STAGES) the later stages are skipped and stay in analysis.incomplete.
+    def finish(stage, started):
+        analysis.timings[stage] = time.perf_counter() - started
+        if not _should_stop(budget):
+            analysis.incomplete.remove(stage)
+            if budget is not None:
+                budget.report(stage, 1, 1, force=True)
+
+    started = time.perf_counter()
+    strict = [rule for rule in analysis.rules if not rule.is_defeasible]
+    analysis.contraposition_rules = create_contrapositions(strict, len(analysis.rules))
+    af = ArgumentationFramework(analysis.rules + analysis.contraposition_rules, budget=budget, spill=analysis.spill)
+    analysis.af = af
+    finish('arguments', started)
+    if _should_stop(budget) or stop_after == 'arguments':
+        return analysis
+
+    started = time.perf_counter()
+    analysis.undercuts = af.detect_undercuts(budget)
+    if analysis.attack_mode != 'undercut':
+        rebuttal_attacks = find_rebuttal_attacks(af.get_arguments(), budget,
+                                                 restricted=analysis.attack_mode == 'restricted')
+        for literal, arguments in rebuttal_attacks.items():
+            rebuttal_attacks[literal] = list(set(arguments))
+        analysis.rebuttal_attacks = rebuttal_attacks
+        analysis.extended_rebuttals = extend_argument_chains(af, rebuttal_attacks, budget)
+        analysis.rebuttals = factorize_rebuttals(analysis.extended_rebuttals, af)
+    finish('attacks', started)
+    if _should_stop(budget) or stop_after == 'attacks':
+        return analysis
+
+    started = time.perf_counter()
+    analysis.defeats = af.attack_list('defeats')
+    analysis.defeats.extend(find_defeated(af, analysis.undercuts, budget=budget))
+    analysis.defeats.extend(analysis.rebuttals.iter_defeats(af, budget))
+    finish('defeats', started)
+    if _should_stop(budget) or stop_after == 'defeats':
+        return analysis
+
+    started = time.perf_counter()
+    analysis.burden_numbers = af.compute_burdens_with_defeats(analysis.defeats, max_depth=max_depth,
+                                                              attacks=analysis.attacks(), budget=budget)
+    analysis.ranked_arguments = af.rank_arguments_with_defeats(analysis.burden_numbers)
+    finish('burdens', started)
+    return analysis
+
+
+def analyze_many(rule_bases, max_workers=None, max_depth=3, attack_mode='unrestricted'):
+    # Each rule base gets its own framework, so the analyses can safely run side by side
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda rules: analyze(rules, max_depth=max_depth, attack_mode=attack_mode),
+                                 rule_bases))
+
+
+
+def _weight_columns(af, arguments):
+    # Defeasible rules of every argument, laid out as a flat list of column indices
+    # (one column per distinct defeasible rule) with per-argument offsets
+    columns = []
+    column_index = {}
+    flat = []
+    offsets = [0]
+    for arg in arguments:
+        for rule in af.get_defeasible_rules_for_argument(arg):
+            if rule not in column_index:
+                column_index[rule] = len(columns)
+                columns.append(rule)
+            flat.append(column_index[rule])
+        offsets.append(len(flat))
+    return columns, np.array(flat, dtype=np.intp), np.array(offsets, dtype=np.intp)
+
+
+def _sweep_chunk(assignments, columns, flat, offsets, src, dst, n, max_depth):
+    k = len(assignments)
+    has_rules = offsets[1:] > offsets[:-1]
+    starts = offsets[:-1][has_rules]
+
+    # Strongest and weakest defeasible rule of every argument, for every assignment at once
+    weights = np.array([[rule_weight(rule, assignment) for rule in columns] for assignment in assignments],
+                       dtype=float).reshape(k, len(columns))
+    strongest = np.full((k, n), -np.inf)
+    weakest = np.full((k, n), np.inf)
+    if len(starts):
+        gathered = weights[:, flat]
+        strongest[:, has_rules] = np.maximum.reduceat(gathered, starts, axis=1)
+        weakest[:, has_rules] = np.minimum.reduceat(gathered, starts, axis=1)
+
+    # Same test as attack_succeeds, on every (assignment, attack) cell
+    defeat_mask = ~has_rules[src] | (has_rules[dst] & (strongest[:, src] >= weakest[:, dst]))
+    defeated = np.zeros((k, n), dtype=bool)
+    rows, cols = np.nonzero(defeat_mask)
+    defeated[rows, dst[cols]] = True
+
+    # Same recurrence as compute_burdens_with_defeats, summed with one bincount per depth
+    burdens = np.empty((k, n, max_depth + 1))
+    burdens[:, :, 0] = 1
+    flat_targets = (np.arange(k)[:, None] * n + dst[None, :]).ravel()
+    for depth in range(1, max_depth + 1):
+        previous = burdens[:, :, depth - 1]
+        contributions = np.where(defeated[:, src], 0.0, 1.0 / previous[:, src])
+        totals = np.bincount(flat_targets, weights=contributions.ravel(), minlength=k * n).reshape(k, n)
+        burdens[:, :, depth] = np.where(defeated, np.inf, 1 + totals)
+    return defeat_mask, defeated, burdens
+
+
+def sweep_rule_weights(rules, weight_assignments, max_depth=3, chunk_size=64, attack_mode='unrestricted'):
+    # Arguments and attacks don't depend on rule weights: the pipeline stops after the
+    # attacks stage, then defeats, burdens and rankings are evaluated for every assignment
+    # ({rule reference: weight}) over that one attack relation, which is also the one the
+    # burden numbers propagate along. The first point is the baseline (the rules' own
+    # weights); every point reports how its defeats, defeated arguments and ranking differ
+    # from it.
+    analysis = run_analysis(Analysis(rules, attack_mode), max_depth=max_depth, stop_after='attacks')
+    af = analysis.af
+    arguments = af.get_arguments()
+    names = [arg.name for arg in arguments]
+    n = len(arguments)
+    chunks = list(iter_attack_id_chunks(analysis.attacks()))
+    src = np.concatenate([np.zeros(0, dtype=np.intp)] + [sources for sources, _ in chunks]).astype(np.intp)
+    dst = np.concatenate([np.zeros(0, dtype=np.intp)] + [targets for _, targets in chunks]).astype(np.intp)
+    columns, flat, offsets = _weight_columns(af, arguments)
+
+    assignments = [{}] + [dict(assignment) for assignment in weight_assignments]
+    points = []
+    baseline = None
+    for chunk_start in range(0, len(assignments), chunk_size):
+        chunk = assignments[chunk_start:chunk_start + chunk_size]
+        defeat_mask, defeated, burdens = _sweep_chunk(chunk, columns, flat, offsets, src, dst, n, max_depth)
+        for row, assignment in enumerate(chunk):
+            # Lexicographic order on the burden vectors, ties kept in argument order
+            keys = [np.arange(n)] + [burdens[row, :, depth] for depth in range(max_depth, -1, -1)]
+            ranking = [names[i] for i in np.lexsort(keys)]
+            point = {
+                'weights': assignment,
+                'defeat_mask': defeat_mask[row],
+                'defeats': int(defeat_mask[row].sum()),
+                'defeated_arguments': [names[i] for i in np.flatnonzero(defeated[row])],
+                'burden_numbers': {names[i]: burdens[row, i].tolist() for i in range(n)},
+                'ranking': ranking,
+            }
+            if baseline is None:
+                baseline = point
+            changed = np.flatnonzero(point['defeat_mask'] != baseline['defeat_mask'])
+            point['defeats_added'] = [(names[src[i]], names[dst[i]]) for i in changed if point['defeat_mask'][i]]
+            point['defeats_removed'] = [(names[src[i]], names[dst[i]]) for i in changed if not point['defeat_mask'][i]]
+            baseline_defeated = set(baseline['defeated_arguments'])
+            point['newly_defeated'] = [name for name in point['defeated_arguments'] if name not in baseline_defeated]
+            point['no_longer_defeated'] = sorted(baseline_defeated - set(point['defeated_arguments']))
+            baseline_rank = {name: position for position, name in enumerate(baseline['ranking'])}
+            point['rank_changes'] = {name: (baseline_rank[name], position)
+                                     for position, name in enumerate(ranking) if baseline_rank[name] != position}
+            points.append(point)
+    return points
+
+
+if __name__ == "__main__":
+    analysis = analyze(strict_rules + defeasible_rules)
+    analysis.af.show_all_arguments()
+    print("number of attacks:", analysis.count_attacks())
+    print("number of defeats:", len(analysis.defeats))
+    for arg in analysis.ranked_arguments:
+        print(f"Argument: {arg}, Burden: {analysis.burden_numbers[arg]}")
+    comparator = ArgumentComparator.from_analysis(analysis)
+    print("strongest arguments:", [(arg.name, strength) for arg, strength in comparator.strongest(3)])
+    print("weakest arguments:", [(arg.name, strength) for arg, strength in comparator.weakest(3)])
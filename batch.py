@@ -0,0 +1,249 @@
+# Batch evaluation of many rule bases (scenarios) across a process pool.
+#
+#   python batch.py scenarios/ -o results.jsonl --workers 8 --timeout 60
+#   cat scenarios.jsonl | python batch.py - > results.jsonl
+#
+# A scenario is a JSON object:
+#   {"id": "s1", "rules": [{"reference": "r1", "premises": ["b", "~d"], "conclusion": "c",
+#                           "defeasible": false, "weight": 0}, ...]}
+# or points at a text rule file instead (see rule_parser.py):
+#   {"id": "s2", "rule_file": "scenarios/s2.aspic"}
+# The input is either a JSONL stream (one scenario per line) or a directory of .json files
+# (one scenario each, the file name is the default id), .jsonl files and .aspic rule files.
+# One JSON result per scenario is written as soon as it is ready (completion order).
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import aspic_generator as ag
+import rule_parser
+import storage
+
+
+class ScenarioTimeout(Exception):
+    pass
+
+
+def scenario_rules(scenario):
+    if 'rule_file' in scenario:
+        return rule_parser.load_rules(scenario['rule_file'])
+    return rules_from_json(scenario.get('rules', []))
+
+
+def rules_from_json(rule_dicts):
+    rules = []
+    for index, rule in enumerate(rule_dicts, start=1):
+        premises = [ag.parse_literal(premise) for premise in rule.get('premises', [])]
+        rules.append(ag.Rule(premises, ag.parse_literal(rule['conclusion']),
+                             is_defeasible=bool(rule.get('defeasible', False)),
+                             reference=rule.get('reference', f'r{index}'),
+                             rule_weight=rule.get('weight', 0)))
+    return rules
+
+
+def _check_scenario(scenario, location):
+    # Anything but a JSON object becomes an error record, so one bad entry can't stop the batch
+    if isinstance(scenario, dict):
+        return scenario
+    return {'error': f'{location}: expected a JSON object, got {type(scenario).__name__}'}
+
+
+def iter_jsonl(stream, source):
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            scenario = _check_scenario(json.loads(line), f'{source}:{line_number}')
+        except ValueError as error:
+            scenario = {'error': f'{source}:{line_number}: {error}'}
+        scenario.setdefault('id', f'{source}:{line_number}')
+        yield scenario
+
+
+def iter_scenarios(source):
+    # Scenarios are read lazily so that the input never has to fit in memory
+    if source == '-':
+        yield from iter_jsonl(sys.stdin, '<stdin>')
+    elif os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            path = os.path.join(source, file_name)
+            stem, extension = os.path.splitext(file_name)
+            if extension == '.jsonl':
+                with open(path, encoding='utf-8') as stream:
+                    yield from iter_jsonl(stream, path)
+            elif extension == '.json':
+                try:
+                    with open(path, encoding='utf-8') as stream:
+                        scenario = _check_scenario(json.load(stream), path)
+                except ValueError as error:
+                    scenario = {'error': f'{path}: {error}'}
+                scenario.setdefault('id', stem)
+                yield scenario
+            elif extension == '.aspic':
+                # Parsed in the worker, so only the path crosses the process boundary
+                yield {'id': stem, 'rule_file': path}
+    else:
+        with open(source, encoding='utf-8') as stream:
+            yield from iter_jsonl(stream, source)
+
+
+def _burdens_to_json(burdens):
+    # JSON has no infinity: defeated arguments get null burdens
+    return [None if math.isinf(burden) else burden for burden in burdens]
+
+
+def summarize(scenario_id, analysis, top=None):
+    ranked = analysis.ranked_arguments if top is None else analysis.ranked_arguments[:top]
+    return {
+        'id': scenario_id,
+        'rules': len(analysis.rules),
+        'attack_mode': analysis.attack_mode,
+        'contrapositions': len(analysis.contraposition_rules),
+        'arguments': analysis.af.count_arguments(),
+        'undercuts': len(analysis.undercuts),
+        'rebuttals': len(analysis.rebuttals),
+        'attacks': analysis.count_attacks(),
+        'defeats': len(analysis.defeats),
+        'ranking': [{'argument': name, 'burdens': _burdens_to_json(analysis.burden_numbers[name])}
+                    for name in ranked],
+        'timings': analysis.timings,
+    }
+
+
+def _raise_timeout(signum, frame):
+    raise ScenarioTimeout()
+
+
+def run_scenario(scenario, max_depth=3, timeout=None, top=None, attack_mode='unrestricted', spill_dir=None):
+    # Runs inside a worker process; never raises, errors are reported in the result
+    scenario_id = scenario.get('id')
+    if 'error' in scenario:
+        return {'id': scenario_id, 'error': scenario['error']}
+    use_alarm = timeout and hasattr(signal, 'setitimer')
+    started = time.perf_counter()
+    try:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        # The library prints diagnostics; keep them out of the JSONL results on stdout. With
+        # a spill directory the arguments, undercuts and defeats live in files that are
+        # deleted once the scenario is summarized.
+        with contextlib.redirect_stdout(sys.stderr), \
+                (storage.SpillStore(spill_dir) if spill_dir else contextlib.nullcontext()) as spill:
+            analysis = ag.analyze(scenario_rules(scenario), max_depth=max_depth, attack_mode=attack_mode,
+                                  spill=spill)
+            result = summarize(scenario_id, analysis, top=top)
+    except ScenarioTimeout:
+        result = {'id': scenario_id, 'error': f'timeout after {timeout}s'}
+    except rule_parser.RuleSyntaxError as error:
+        result = {'id': scenario_id, 'error': f'syntax error: {error}'}
+    except Exception as error:
+        result = {'id': scenario_id, 'error': f'{type(error).__name__}: {error}'}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result['elapsed'] = time.perf_counter() - started
+    return result
+
+
+def _crash_result(scenario, error):
+    return {'id': scenario.get('id'), 'error': f'{type(error).__name__}: {error}'}
+
+
+def run_batch(scenarios, workers=None, max_depth=3, timeout=None, top=None, max_pending=None,
+              attack_mode='unrestricted', spill_dir=None):
+    # Yields results as they complete. At most 'max_pending' scenarios are in flight at
+    # once, which bounds memory however long the input stream is.
+    #
+    # run_scenario never raises, but a worker can die (e.g. killed for memory), which breaks
+    # the pool and fails every scenario in flight. Those scenarios are run again in a fresh
+    # pool, one at a time, so that only the one that breaks the pool again gets an error.
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    options = (max_depth, timeout, top, attack_mode, spill_dir)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {}  # future -> scenario
+    crashed = []  # scenarios in flight when a pool broke
+
+    def submit(scenario):
+        nonlocal executor
+        try:
+            return executor.submit(run_scenario, scenario, *options)
+        except BrokenProcessPool:
+            executor.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=workers)
+            return executor.submit(run_scenario, scenario, *options)
+
+    def collect(futures):
+        for future in futures:
+            scenario = pending.pop(future)
+            try:
+                yield future.result()
+            except BrokenProcessPool:
+                crashed.append(scenario)
+            except Exception as error:
+                yield _crash_result(scenario, error)
+
+    def rerun_crashed():
+        # Waits for everything in flight first, so each scenario runs alone
+        yield from collect(as_completed(list(pending)))
+        while crashed:
+            scenario = crashed.pop(0)
+            try:
+                yield submit(scenario).result()
+            except Exception as error:
+                yield _crash_result(scenario, error)
+
+    try:
+        for scenario in scenarios:
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+                if crashed:
+                    yield from rerun_crashed()
+            pending[submit(scenario)] = scenario
+        yield from rerun_crashed()
+    finally:
+        executor.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the ASPIC pipeline over many rule bases.')
+    parser.add_argument('input', help="directory of .json/.jsonl/.aspic scenarios, a .jsonl file, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL results file ('-' for stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--timeout', type=float, default=None, help='per-scenario time limit in seconds')
+    parser.add_argument('--max-depth', type=int, default=3, help='burden depth')
+    parser.add_argument('--attack-mode', choices=ag.ATTACK_MODES, default='unrestricted',
+                        help='which attacks to compute (restricted rebut and undercut-only are cheaper)')
+    parser.add_argument('--spill-dir', default=None,
+                        help='keep arguments and attacks in memory-mapped files under this directory')
+    parser.add_argument('--top', type=int, default=None, help='only report the N best ranked arguments')
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    failures = 0
+    try:
+        for result in run_batch(iter_scenarios(args.input), workers=args.workers, max_depth=args.max_depth,
+                                timeout=args.timeout, top=args.top, attack_mode=args.attack_mode,
+                                spill_dir=args.spill_dir):
+            failures += 'error' in result
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# Batch verification of candidate extensions against a defeat graph.
+#
+# Candidates (sets of argument names or Argument objects, or a boolean matrix with one row
+# per candidate) are checked all at once:
+#
+#   - conflict-free: no defeat between two members
+#   - admissible:    conflict-free, and every member is defended (each of its defeaters is
+#                    defeated by a member)
+#   - complete:      admissible, and contains every argument it defends
+#   - stable:        conflict-free, and defeats every argument outside it
+#
+# Candidates are packed as bitsets across 64-bit words: row a of the packed matrix holds
+# one bit per candidate, set when argument a is a member. Edges are sorted by defeated
+# argument once, so "which arguments are defeated by a member" for 64 candidates at a time
+# is a gather of the defeaters' rows and one np.bitwise_or.reduceat over the edges.
+#
+#     verifier = ExtensionVerifier.from_analysis(analysis)
+#     checks = verifier.verify([{'A1', 'A3'}, {'A2'}])
+#     checks['admissible']  # -> array([ True, False])
+
+import numpy as np
+
+from semantics import DefeatGraph
+
+PROPERTIES = ('conflict_free', 'admissible', 'complete', 'stable')
+
+
+class ExtensionVerifier:
+    def __init__(self, arguments, defeats=None):
+        # Accepts a semantics.DefeatGraph, or the arguments and defeats to build one from
+        graph = arguments if isinstance(arguments, DefeatGraph) else DefeatGraph(arguments, defeats)
+        self.names = graph.names
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.n = graph.n
+        order = np.argsort(graph.dst, kind='stable')
+        self.src = graph.src[order]
+        self.dst = graph.dst[order]
+        # Arguments with at least one defeater, and where their defeaters start in src
+        self.defeated, self.starts = np.unique(self.dst, return_index=True)
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        return cls(DefeatGraph.from_analysis(analysis))
+
+    def encode(self, candidates):
+        # One boolean row per candidate set
+        if isinstance(candidates, np.ndarray):
+            if candidates.ndim != 2 or candidates.shape[1] != self.n:
+                raise ValueError(f"expected a (candidates, {self.n}) matrix, got shape {candidates.shape}")
+            return candidates.astype(bool, copy=False)
+        rows = [[self._position(member) for member in candidate] for candidate in candidates]
+        members = np.zeros((len(rows), self.n), dtype=bool)
+        members[np.repeat(np.arange(len(rows)), [len(row) for row in rows]),
+                np.fromiter((i for row in rows for i in row), dtype=np.intp)] = True
+        return members
+
+    def _position(self, member):
+        name = member if isinstance(member, str) else member.name
+        try:
+            return self.index[name]
+        except KeyError:
+            raise ValueError(f"unknown argument {name!r}") from None
+
+    def defeated_by(self, packed):
+        # Bit k of row a is set when some member of candidate k defeats argument a
+        out = np.zeros_like(packed)
+        if len(self.src):
+            out[self.defeated] = np.bitwise_or.reduceat(packed[self.src], self.starts, axis=0)
+        return out
+
+    def _check(self, members):
+        count = len(members)
+        packed = _pack(members)
+        defeated = self.defeated_by(packed)
+        # a is defended when none of its defeaters escapes 'defeated'
+        undefended = self.defeated_by(~defeated)
+
+        def any_argument(bits):
+            # Per candidate: is the bit set for at least one argument
+            return _unpack(np.bitwise_or.reduce(bits, axis=0), count)
+
+        conflict_free = ~any_argument(packed & defeated)
+        admissible = conflict_free & ~any_argument(packed & undefended)
+        return {
+            'conflict_free': conflict_free,
+            'admissible': admissible,
+            'complete': admissible & ~any_argument(undefended ^ ~packed),
+            'stable': conflict_free & ~any_argument(~(packed | defeated)),
+        }
+
+    def verify(self, candidates, chunk_size=4096):
+        # {property: boolean array with one entry per candidate}; candidates are checked
+        # 'chunk_size' at a time to bound the size of the intermediate matrices
+        members = self.encode(candidates)
+        results = {name: np.zeros(len(members), dtype=bool) for name in PROPERTIES}
+        for start in range(0, len(members), chunk_size):
+            checks = self._check(members[start:start + chunk_size])
+            for name in PROPERTIES:
+                results[name][start:start + chunk_size] = checks[name]
+        return results
+
+
+def _pack(members):
+    # (candidates, arguments) booleans -> (arguments, words) uint64 bitsets over candidates
+    count, n = members.shape
+    words = -(-count // 64)
+    packed = np.zeros((n, words * 8), dtype=np.uint8)
+    packed[:, :-(-count // 8)] = np.packbits(members.T, axis=1, bitorder='little')
+    return packed.view(np.uint64)
+
+
+def _unpack(word_row, count):
+    return np.unpackbits(word_row.view(np.uint8), bitorder='little')[:count].astype(bool)
+
+
+def verify_extensions(analysis, candidates, chunk_size=4096):
+    # Checks candidate sets against the defeats of an aspic_generator.Analysis
+    return ExtensionVerifier.from_analysis(analysis).verify(candidates, chunk_size)
@@ -0,0 +1,225 @@
+# Streaming import/export of argumentation graphs.
+#
+#   - ICCMA APX:  arg(A1).  att(A1,A2).
+#   - TGF:        one "id label" line per argument, a "#" line, then "source target label"
+#                 edge lines (the label is "attack" or "defeat")
+#   - GraphML:    arguments are nodes (with their conclusion and top rule), attacks and
+#                 defeats are edges with a "relation" attribute
+#
+# Writers take a file handle and iterables (Argument objects or plain names) and write
+# line by line, so the whole document never exists in memory; edge iterables can be
+# generators, e.g. analysis.attacks() or FactorizedAttacks. Readers are generators too.
+
+import re
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+ATTACK = 'attack'
+DEFEAT = 'defeat'
+
+_APX_STATEMENT = re.compile(r'\s*(arg|att)\s*\(\s*([^,()\s]+)\s*(?:,\s*([^,()\s]+)\s*)?\)\s*\.\s*')
+_GRAPHML_NS = 'http://graphml.graphdrawing.org/xmlns'
+
+
+class GraphFormatError(ValueError):
+    def __init__(self, message, source='<input>', line=0):
+        super().__init__(f"{source}:{line}: {message}")
+        self.message = message
+        self.source = source
+        self.line = line
+
+
+def _name(argument):
+    return argument if isinstance(argument, str) else argument.name
+
+
+def _edges(relations):
+    # relations: {relation label: iterable of (attacker, attacked)}
+    for relation, pairs in relations.items():
+        for attacker, attacked in pairs:
+            yield _name(attacker), _name(attacked), relation
+
+
+def _source(handle):
+    return getattr(handle, 'name', '<input>')
+
+
+# ICCMA APX
+
+def write_apx(handle, arguments, attacks):
+    # APX has a single relation: pass either the attacks or the defeats
+    for argument in arguments:
+        handle.write(f"arg({_name(argument)}).\n")
+    for attacker, attacked in attacks:
+        handle.write(f"att({_name(attacker)},{_name(attacked)}).\n")
+
+
+def iter_apx(handle):
+    # Yields ('arg', name) and ('att', attacker, attacked) statements in file order
+    source = _source(handle)
+    for line_number, line in enumerate(handle, start=1):
+        line = line.split('%', 1)[0]
+        position = 0
+        while position < len(line) and not line[position:].isspace():
+            match = _APX_STATEMENT.match(line, position)
+            if match is None:
+                raise GraphFormatError(f"invalid APX statement {line[position:].strip()!r}", source, line_number)
+            kind, first, second = match.groups()
+            if (kind == 'arg') != (second is None):
+                raise GraphFormatError(f"{kind} expects {'1' if kind == 'arg' else '2'} argument(s)",
+                                       source, line_number)
+            yield (kind, first) if kind == 'arg' else (kind, first, second)
+            position = match.end()
+
+
+def read_apx(handle):
+    arguments, attacks = [], []
+    for statement in iter_apx(handle):
+        if statement[0] == 'arg':
+            arguments.append(statement[1])
+        else:
+            attacks.append(statement[1:])
+    return arguments, attacks
+
+
+# TGF
+
+def write_tgf(handle, arguments, attacks=(), defeats=()):
+    for argument in arguments:
+        label = argument if isinstance(argument, str) else argument.top_rule.conclusion
+        handle.write(f"{_name(argument)} {label}\n")
+    handle.write("#\n")
+    for attacker, attacked, relation in _edges({ATTACK: attacks, DEFEAT: defeats}):
+        handle.write(f"{attacker} {attacked} {relation}\n")
+
+
+def iter_tgf(handle):
+    # Yields ('arg', name, label) then ('att', attacker, attacked, label) entries
+    source = _source(handle)
+    in_edges = False
+    for line_number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if line == '#':
+            in_edges = True
+            continue
+        if in_edges:
+            fields = line.split(None, 2)
+            if len(fields) < 2:
+                raise GraphFormatError(f"expected 'source target [label]', got {line!r}", source, line_number)
+            yield ('att', fields[0], fields[1], fields[2] if len(fields) == 3 else '')
+        else:
+            fields = line.split(None, 1)
+            yield ('arg', fields[0], fields[1] if len(fields) == 2 else '')
+
+
+def read_tgf(handle):
+    # Returns (argument names, attacks, defeats); unlabelled edges count as attacks
+    arguments, attacks, defeats = [], [], []
+    for entry in iter_tgf(handle):
+        if entry[0] == 'arg':
+            arguments.append(entry[1])
+        elif entry[3] == DEFEAT:
+            defeats.append(entry[1:3])
+        else:
+            attacks.append(entry[1:3])
+    return arguments, attacks, defeats
+
+
+# GraphML
+
+def write_graphml(handle, arguments, attacks=(), defeats=()):
+    handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    handle.write(f'<graphml xmlns="{_GRAPHML_NS}">\n')
+    handle.write('  <key id="conclusion" for="node" attr.name="conclusion" attr.type="string"/>\n')
+    handle.write('  <key id="rule" for="node" attr.name="rule" attr.type="string"/>\n')
+    handle.write('  <key id="defeasible" for="node" attr.name="defeasible" attr.type="boolean"/>\n')
+    handle.write('  <key id="relation" for="edge" attr.name="relation" attr.type="string"/>\n')
+    handle.write('  <graph id="af" edgedefault="directed">\n')
+    for argument in arguments:
+        if isinstance(argument, str):
+            handle.write(f'    <node id={quoteattr(argument)}/>\n')
+            continue
+        rule = argument.top_rule
+        handle.write(f'    <node id={quoteattr(argument.name)}>'
+                     f'<data key="conclusion">{escape(str(rule.conclusion))}</data>'
+                     f'<data key="rule">{escape(str(rule.reference))}</data>'
+                     f'<data key="defeasible">{"true" if rule.is_defeasible else "false"}</data></node>\n')
+    for attacker, attacked, relation in _edges({ATTACK: attacks, DEFEAT: defeats}):
+        handle.write(f'    <edge source={quoteattr(attacker)} target={quoteattr(attacked)}>'
+                     f'<data key="relation">{relation}</data></edge>\n')
+    handle.write('  </graph>\n</graphml>\n')
+
+
+def iter_graphml(handle):
+    # Yields ('arg', name, {key: value}) and ('att', attacker, attacked, relation) while
+    # parsing; elements are cleared as soon as they are read
+    keys = {}
+    graph = None
+    node_tag, edge_tag = f'{{{_GRAPHML_NS}}}node', f'{{{_GRAPHML_NS}}}edge'
+    key_tag, data_tag = f'{{{_GRAPHML_NS}}}key', f'{{{_GRAPHML_NS}}}data'
+    graph_tag = f'{{{_GRAPHML_NS}}}graph'
+    for event, element in ET.iterparse(handle, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag in (graph_tag, 'graph'):
+                graph = element
+            continue
+        if tag in (key_tag, 'key'):
+            keys[element.get('id')] = element.get('attr.name', element.get('id'))
+        elif tag in (node_tag, 'node'):
+            data = {keys.get(child.get('key'), child.get('key')): child.text or ''
+                    for child in element if child.tag in (data_tag, 'data')}
+            yield ('arg', element.get('id'), data)
+            if graph is not None:
+                graph.clear()  # drop the finished children so memory stays flat
+        elif tag in (edge_tag, 'edge'):
+            relation = ATTACK
+            for child in element:
+                if child.tag in (data_tag, 'data') and keys.get(child.get('key'), child.get('key')) == 'relation':
+                    relation = child.text or ATTACK
+            yield ('att', element.get('source'), element.get('target'), relation)
+            if graph is not None:
+                graph.clear()
+
+
+def read_graphml(handle):
+    # Returns (argument names, attacks, defeats)
+    arguments, attacks, defeats = [], [], []
+    for entry in iter_graphml(handle):
+        if entry[0] == 'arg':
+            arguments.append(entry[1])
+        elif entry[3] == DEFEAT:
+            defeats.append(entry[1:3])
+        else:
+            attacks.append(entry[1:3])
+    return arguments, attacks, defeats
+
+
+# Frameworks
+
+def write_analysis(handle, analysis, format='graphml', relation=ATTACK):
+    # Writes the arguments, attacks and defeats of an aspic_generator.Analysis.
+    # APX only holds one relation, chosen with 'relation'.
+    arguments = analysis.af.get_arguments()
+    if format == 'apx':
+        write_apx(handle, arguments, analysis.defeats if relation == DEFEAT else analysis.attacks())
+    elif format == 'tgf':
+        write_tgf(handle, arguments, analysis.attacks(), analysis.defeats)
+    elif format == 'graphml':
+        write_graphml(handle, arguments, analysis.attacks(), analysis.defeats)
+    else:
+        raise ValueError(f"unknown graph format {format!r}")
+
+
+def resolve_pairs(af, pairs):
+    # Turns (name, name) pairs read back from a file into the framework's Argument objects
+    by_name = {argument.name: argument for argument in af.get_arguments()}
+    resolved = []
+    for attacker, attacked in pairs:
+        try:
+            resolved.append((by_name[attacker], by_name[attacked]))
+        except KeyError as error:
+            raise ValueError(f"unknown argument {error.args[0]!r}") from None
+    return resolved
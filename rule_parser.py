@@ -0,0 +1,232 @@
+# Plain-text ASPIC rule bases.
+#
+# One rule per line:
+#
+#     [reference:] premise, premise, ... ARROW conclusion [@ weight]
+#
+#   - ARROW is '->' (or '→') for a strict rule and '=>' (or '⇒') for a defeasible one
+#   - a literal is a name, negated with a leading '~' (or '¬'); rule references are names
+#     too, so '~r4' is the literal that undercuts rule r4
+#   - the reference is optional (a rule without one is named rN, N its position among the
+#     rules, or the next free rN when that name is taken) and so is the weight (default 0);
+#     references must be unique, a reference used twice is a syntax error
+#   - blank lines and everything after '#' are ignored
+#
+# Example:
+#
+#     r1: -> a
+#     r2: b, d -> c
+#     r4: a => ~d
+#     r5: => b @ 1
+#
+# Rule.__repr__ output ("r2: b, d → c") is valid input, so printed rules can be read back.
+
+import re
+
+import aspic_generator as ag
+
+STRICT_ARROWS = ('->', '→')
+DEFEASIBLE_ARROWS = ('=>', '⇒')
+_ARROWS = re.compile('->|=>|→|⇒')
+_FORBIDDEN_IN_NAMES = re.compile(r'[\s,:@#~¬]')
+# Well-formed rules are matched in one go; anything else goes through the slower,
+# step by step parse that reports where the line is wrong
+_WELL_FORMED_RULE = re.compile(r'\s*(?:([^\s,:@#~¬>=→⇒]+)\s*:)?([^:@#>=→⇒]*?)(->|=>|→|⇒)'
+                               r'\s*([~¬]?[^\s,:@#~¬>=→⇒]+)\s*(?:@\s*([0-9.eE+-]+))?\s*\Z')
+
+
+class RuleSyntaxError(ValueError):
+    def __init__(self, message, source='<input>', line=0, column=0, text=''):
+        super().__init__(f"{source}:{line}:{column}: {message}")
+        self.message = message
+        self.source = source
+        self.line = line
+        self.column = column
+        self.text = text
+
+
+def _find_arrow(text):
+    # Returns (position, arrow, is_defeasible) of the single arrow in the line, or the
+    # list of arrows found when there isn't exactly one
+    found = [(match.start(), match.group(), match.group() in DEFEASIBLE_ARROWS)
+             for match in _ARROWS.finditer(text)]
+    if len(found) != 1:
+        return found
+    return found[0]
+
+
+class RuleParser:
+    # Streaming parser: feed it lines, get Rule objects back one at a time. Literal texts
+    # are cached per parser so that repeated literals cost a single dict lookup.
+    def __init__(self, source='<input>'):
+        self.source = source
+        self.literals = {}
+        self.references = {}  # reference -> line it was given on
+        self.rule_count = 0
+
+    def error(self, message, line_number, column, text):
+        return RuleSyntaxError(message, self.source, line_number, column, text)
+
+    def literal(self, text, line_number, column, line):
+        literal = self.literals.get(text)
+        if literal is None:
+            stripped = text.strip()
+            negative = stripped[:1] in ('~', '¬')
+            name = stripped[1:].lstrip() if negative else stripped
+            if not name:
+                raise self.error("missing literal", line_number, column, line)
+            bad = _FORBIDDEN_IN_NAMES.search(name)
+            if bad is not None:
+                bad_column = column + text.index(name) + bad.start()
+                raise self.error(f"unexpected {bad.group()!r} in literal {stripped!r}", line_number, bad_column, line)
+            literal = ag.Literal(name, is_negative=negative)
+            self.literals[text] = literal
+        return literal
+
+    def name_rule(self, reference, number, line_number, column, line):
+        # Checks an explicit reference, or names rule 'number' when it has none
+        if reference is None:
+            reference = f'r{number}'
+            while reference in self.references:
+                number += 1
+                reference = f'r{number}'
+        elif reference in self.references:
+            raise self.error(f"duplicate rule reference {reference!r} (already used on line "
+                             f"{self.references[reference]})", line_number, column, line)
+        self.references[reference] = line_number
+        return reference
+
+    def parse_line(self, line, line_number):
+        # Returns a Rule, or None for blank and comment lines
+        match = _WELL_FORMED_RULE.match(line)
+        if match is not None:
+            try:
+                return self._build_rule(match, line, line_number)
+            except (RuleSyntaxError, ValueError):
+                pass  # let the detailed parse below report the error
+        return self._parse_line_slowly(line, line_number)
+
+    def _build_rule(self, match, line, line_number):
+        reference, premises_text, arrow, conclusion_text, weight_text = match.groups()
+        literals = self.literals
+        premises = []
+        if premises_text.strip():
+            for premise_text in premises_text.split(','):
+                literal = literals.get(premise_text)
+                if literal is None:
+                    literal = self.literal(premise_text, line_number, match.start(2) + 1, line)
+                premises.append(literal)
+        conclusion = literals.get(conclusion_text)
+        if conclusion is None:
+            conclusion = self.literal(conclusion_text, line_number, match.start(4) + 1, line)
+        weight = 0
+        if weight_text is not None:
+            weight = int(weight_text) if weight_text.lstrip('+-').isdigit() else float(weight_text)
+        # Named last, so that a line the slow parse has to redo has not taken a reference yet
+        reference = self.name_rule(reference, self.rule_count + 1, line_number, match.start() + 1, line)
+        rule = ag.Rule(premises, conclusion, is_defeasible=arrow in DEFEASIBLE_ARROWS, reference=reference,
+                       rule_weight=weight)
+        self.rule_count += 1
+        return rule
+
+    def _parse_line_slowly(self, line, line_number):
+        text = line.split('#', 1)[0].rstrip()
+        if not text.strip():
+            return None
+        self.rule_count += 1
+
+        arrow = _find_arrow(text)
+        if isinstance(arrow, list):
+            if not arrow:
+                raise self.error("expected '->' or '=>'", line_number, len(text) - len(text.lstrip()) + 1, line)
+            raise self.error("more than one arrow in rule", line_number, arrow[1][0] + 1, line)
+        arrow_position, arrow_text, is_defeasible = arrow
+
+        head, body = text[:arrow_position], text[arrow_position + len(arrow_text):]
+
+        # Optional "reference:" before the premises
+        reference_end = head.find(':')
+        reference_column = len(head) - len(head.lstrip()) + 1
+        if reference_end != -1:
+            reference = head[:reference_end].strip()
+            if not reference or _FORBIDDEN_IN_NAMES.search(reference):
+                raise self.error(f"invalid rule reference {reference!r}", line_number, reference_column, line)
+            premises_start = reference_end + 1
+        else:
+            reference = None
+            premises_start = 0
+        reference = self.name_rule(reference, self.rule_count, line_number, reference_column, line)
+
+        # Premises: comma separated, possibly none
+        premises = []
+        premises_text = head[premises_start:]
+        if premises_text.strip():
+            column = premises_start
+            for premise_text in premises_text.split(','):
+                premises.append(self.literal(premise_text, line_number, column + 1, line))
+                column += len(premise_text) + 1
+
+        # Conclusion and optional "@ weight"
+        weight = 0
+        conclusion_text, at, weight_text = body.partition('@')
+        conclusion_column = arrow_position + len(arrow_text) + 1
+        if at:
+            weight_text = weight_text.strip()
+            try:
+                weight = int(weight_text)
+            except ValueError:
+                try:
+                    weight = float(weight_text)
+                except ValueError:
+                    raise self.error(f"invalid weight {weight_text!r}", line_number,
+                                     conclusion_column + len(conclusion_text) + 1, line) from None
+        if not conclusion_text.strip():
+            raise self.error("missing conclusion", line_number, conclusion_column, line)
+        conclusion = self.literal(conclusion_text, line_number, conclusion_column, line)
+
+        return ag.Rule(premises, conclusion, is_defeasible=is_defeasible, reference=reference,
+                       rule_weight=weight)
+
+    def iter_rules(self, lines):
+        for line_number, line in enumerate(lines, start=1):
+            rule = self.parse_line(line, line_number)
+            if rule is not None:
+                yield rule
+
+
+def iter_rules(lines, source='<input>'):
+    # Lazily parse an iterable of lines (an open file, a list, a text stream...)
+    return RuleParser(source).iter_rules(lines)
+
+
+def parse_rules(text, source='<string>'):
+    return list(iter_rules(text.splitlines(), source))
+
+
+def load_rules(path):
+    with open(path, encoding='utf-8') as stream:
+        return list(iter_rules(stream, path))
+
+
+def format_literal(literal):
+    return f"{'~' if literal.is_negative else ''}{literal.name}"
+
+
+def format_rule(rule):
+    # Rules without a reference are written without one (they are numbered when read back)
+    parts = [f"{rule.reference}:"] if rule.reference else []
+    if rule.premises:
+        parts.append(', '.join(format_literal(premise) for premise in rule.premises))
+    parts.append('=>' if rule.is_defeasible else '->')
+    parts.append(format_literal(rule.conclusion))
+    if rule.rule_weight:
+        parts.append(f"@ {rule.rule_weight}")
+    return ' '.join(parts)
+
+
+def dump_rules(rules, stream):
+    # Writes one rule per line; the output can be read back with iter_rules. Rules without a
+    # reference are named when read back, skipping the references of the rules before them;
+    # a later rule whose reference was taken that way is reported as a duplicate.
+    for rule in rules:
+        stream.write(format_rule(rule) + '\n')
@@ -0,0 +1,190 @@
+# Gradual ranking semantics over a defeat graph.
+#
+#   - h-categorizer:    Hca(a) = 1 / (1 + sum of Hca(b) over the defeaters b of a)
+#   - counting:         v(a) = 1 - (alpha / N) * sum of v(b) over the defeaters b of a, with N
+#                       the largest number of defeaters of an argument (alpha in (0, 1))
+#   - discussion-based: Dis_i(a) = (-1)^i * number of linear discussions of length i ending
+#                       at a (Dis_1 = -1, Dis_2 = number of defeaters, Dis_3 = minus the
+#                       number of defeaters of defeaters...), compared lexicographically,
+#                       smaller first
+#
+# The graph is kept as two integer arrays (defeater, defeated) and every iteration is one
+# gather and one np.bincount over the edges, so an iteration costs O(arguments + defeats).
+# Iterations stop when the scores move by less than 'tolerance' (h-categorizer, counting);
+# discussions stop growing once every argument has its own rank, no discussion gets any
+# longer, or 'patience' more steps did not refine the ranking (arguments on symmetric
+# cycles can tie forever; that cut-off does not count as converged). Passing the result of
+# a previous run as 'initial' warm starts the iteration, e.g. after a few rules changed. The
+# discussion counts only resume when the defeat graph is the same one (argument names are
+# reassigned whenever the rule base changes, so matching names alone prove nothing).
+#
+# Results are dicts: {'semantics', 'scores' ({argument name: score}, a list of Dis_i for the
+# discussion-based semantics), 'ranking' (names, best first, ties in argument order),
+# 'iterations', 'converged', 'graph' (the graph's fingerprint)}.
+
+import hashlib
+
+import numpy as np
+
+SEMANTICS = ('h-categorizer', 'counting', 'discussion')
+
+
+def _name(argument):
+    return argument if isinstance(argument, str) else argument.name
+
+
+class DefeatGraph:
+    # Arguments (Argument objects or names) and defeats ((defeater, defeated) pairs) as arrays.
+    # A defeat listed more than once is kept once (sorted by defeater, then defeated).
+    def __init__(self, arguments, defeats):
+        self.names = [_name(argument) for argument in arguments]
+        index = {name: i for i, name in enumerate(self.names)}
+        pairs = [(index[_name(attacker)], index[_name(attacked)]) for attacker, attacked in defeats]
+        edges = np.unique(np.array(pairs, dtype=np.intp).reshape(len(pairs), 2), axis=0)
+        self.src = edges[:, 0]
+        self.dst = edges[:, 1]
+        self.n = len(self.names)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update('\0'.join(self.names).encode('utf-8'))
+        digest.update(edges.astype(np.int64).tobytes())
+        self.fingerprint = digest.hexdigest()
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        return cls(analysis.af.get_arguments(), analysis.defeats)
+
+    def incoming_sum(self, values):
+        # For every argument, the sum of 'values' over its defeaters
+        return np.bincount(self.dst, weights=values[self.src], minlength=self.n)
+
+    def initial_scores(self, initial, default=1.0):
+        # Warm start vector from a previous result ({'scores': {name: score}}), missing names
+        # (e.g. new arguments) start from the default
+        scores = np.full(self.n, default)
+        if initial is not None:
+            previous = initial['scores']
+            for i, name in enumerate(self.names):
+                if name in previous:
+                    scores[i] = previous[name]
+        return scores
+
+    def result(self, semantics, scores, order, iterations, converged):
+        return {
+            'semantics': semantics,
+            'scores': dict(zip(self.names, scores)),
+            'ranking': [self.names[i] for i in order],
+            'iterations': iterations,
+            'converged': converged,
+            'graph': self.fingerprint,
+        }
+
+
+def _graph(graph, defeats):
+    # Semantics accept a DefeatGraph, or the arguments and defeats to build one from
+    return graph if isinstance(graph, DefeatGraph) else DefeatGraph(graph, defeats)
+
+
+def _fixed_point(graph, step, values, tolerance, max_iterations):
+    for iteration in range(1, max_iterations + 1):
+        updated = step(values)
+        change = np.max(np.abs(updated - values)) if graph.n else 0.0
+        values = updated
+        if change < tolerance:
+            return values, iteration, True
+    return values, max_iterations, False
+
+
+def h_categorizer(graph, defeats=None, tolerance=1e-9, max_iterations=1000, initial=None):
+    graph = _graph(graph, defeats)
+    values = graph.initial_scores(initial)
+    values, iterations, converged = _fixed_point(
+        graph, lambda v: 1.0 / (1.0 + graph.incoming_sum(v)), values, tolerance, max_iterations)
+    # Higher is better
+    order = np.argsort(-values, kind='stable')
+    return graph.result('h-categorizer', values.tolist(), order, iterations, converged)
+
+
+def counting(graph, defeats=None, alpha=0.9, tolerance=1e-9, max_iterations=1000, initial=None):
+    if not 0 < alpha < 1:
+        raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+    graph = _graph(graph, defeats)
+    in_degrees = np.bincount(graph.dst, minlength=graph.n)
+    scale = alpha / max(int(in_degrees.max()) if graph.n else 0, 1)
+    values = graph.initial_scores(initial)
+    values, iterations, converged = _fixed_point(
+        graph, lambda v: 1.0 - scale * graph.incoming_sum(v), values, tolerance, max_iterations)
+    order = np.argsort(-values, kind='stable')
+    return graph.result('counting', values.tolist(), order, iterations, converged)
+
+
+def _refine(classes, column):
+    # Splits the equivalence classes of the ranking so far by the next Dis_i column; class
+    # ids stay in ranking order (smaller is better)
+    order = np.lexsort((column, classes))
+    boundaries = np.empty(len(order), dtype=bool)
+    boundaries[:1] = True
+    boundaries[1:] = (classes[order][1:] != classes[order][:-1]) | (column[order][1:] != column[order][:-1])
+    refined = np.empty_like(classes)
+    refined[order] = np.cumsum(boundaries) - 1
+    return refined
+
+
+def discussion_based(graph, defeats=None, max_steps=50, patience=5, initial=None):
+    # Walk counts can grow exponentially on cycles; they are kept as floats, so very long
+    # discussions compare approximately
+    graph = _graph(graph, defeats)
+    n = graph.n
+    if initial is not None and initial.get('graph') == graph.fingerprint and n:
+        # Resume from the previous counts on the same graph: the last column gives the
+        # current walk counts
+        columns = [np.array(step) for step in zip(*(initial['scores'][name] for name in graph.names))]
+    else:
+        columns = [np.full(n, -1.0)]
+    classes = np.zeros(n, dtype=np.intp)
+    unchanged = 0
+    for column in columns:
+        refined = _refine(classes, column)
+        unchanged = unchanged + 1 if refined.max(initial=0) == classes.max(initial=0) else 0
+        classes = refined
+    walks = np.abs(columns[-1])
+    converged = False
+    while True:
+        if (n and classes.max() == n - 1) or not walks.any():
+            converged = True
+            break
+        if unchanged >= patience or len(columns) >= max_steps:
+            break
+        walks = graph.incoming_sum(walks)
+        column = walks if len(columns) % 2 == 1 else 0.0 - walks
+        columns.append(column)
+        refined = _refine(classes, column)
+        unchanged = unchanged + 1 if refined.max(initial=0) == classes.max(initial=0) else 0
+        classes = refined
+    order = np.argsort(classes, kind='stable')
+    scores = np.stack(columns, axis=1).tolist() if n else []
+    return graph.result('discussion', scores, order, len(columns), converged)
+
+
+def rank(graph, defeats=None, semantics='h-categorizer', **options):
+    if semantics == 'h-categorizer':
+        return h_categorizer(graph, defeats, **options)
+    if semantics == 'counting':
+        return counting(graph, defeats, **options)
+    if semantics == 'discussion':
+        return discussion_based(graph, defeats, **options)
+    raise ValueError(f"unknown semantics {semantics!r}, expected one of {SEMANTICS}")
+
+
+def compare_semantics(graph, defeats=None, semantics=SEMANTICS, options=None, initial=None):
+    # Runs several semantics on the same graph (built once). 'options' and 'initial' are
+    # keyed by semantics name. Also returns each argument's position in every ranking.
+    graph = _graph(graph, defeats)
+    options = options or {}
+    initial = initial or {}
+    results = {name: rank(graph, semantics=name, initial=initial.get(name), **options.get(name, {}))
+               for name in semantics}
+    positions = {argument: {} for argument in graph.names}
+    for name, result in results.items():
+        for position, argument in enumerate(result['ranking'], start=1):
+            positions[argument][name] = position
+    return {'results': results, 'positions': positions}
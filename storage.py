@@ -0,0 +1,181 @@
+# Append-only columnar files for the memory-bounded (spill to disk) mode.
+#
+# A column is a flat file of fixed-width integers with an array typecode ('i' for argument
+# and rule ids, 'q' for offsets). Appends go to a small in-memory buffer that is written to
+# the end of the file when full; reads go through an mmap of the file cast with memoryview,
+# so indexing, slicing and iterating the written part never copies it.
+#
+#     with SpillStore() as spill:
+#         analysis = aspic_generator.analyze(rules, spill=spill)
+#         ...  # use the analysis before the store is closed, closing deletes its files
+
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+import numpy as np
+
+
+class ColumnFile:
+    def __init__(self, path, typecode='i', buffer_size=1 << 16):
+        self.path = path
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self.buffer_size = buffer_size
+        self.buffer = array(typecode)
+        self.file = open(path, 'w+b')
+        self.written = 0  # items in the file
+        self.mapped = memoryview(array(typecode))  # view of the first len(self.mapped) items
+
+    def __len__(self):
+        return self.written + len(self.buffer)
+
+    def append(self, value):
+        self.buffer.append(value)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, values):
+        self.buffer.extend(values)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend_array(self, values):
+        # Writes a NumPy array (or anything with tofile) straight to the file
+        self.flush()
+        values.astype(self.typecode, copy=False).tofile(self.file)
+        self.file.flush()
+        self.written += len(values)
+
+    def flush(self):
+        if self.buffer:
+            self.file.seek(0, os.SEEK_END)
+            self.buffer.tofile(self.file)
+            self.file.flush()
+            self.written += len(self.buffer)
+            self.buffer = array(self.typecode)
+
+    def _remap(self):
+        # Maps everything written so far; older views stay valid
+        if len(self.mapped) != self.written:
+            mapping = mmap.mmap(self.file.fileno(), self.written * self.itemsize, access=mmap.ACCESS_READ)
+            self.mapped = memoryview(mapping).cast(self.typecode)
+        return self.mapped
+
+    def view(self):
+        # Zero-copy view of every item appended so far (the buffer is written out first)
+        self.flush()
+        return self._remap()
+
+    def __getitem__(self, index):
+        # Reads never flush the buffer: items still in it are read from it, and the file is
+        # only remapped when a read reaches past the mapped part
+        if isinstance(index, int):
+            if 0 <= index < len(self.mapped):
+                return self.mapped[index]
+            if index < 0:
+                index += len(self)
+            if index >= self.written:
+                return self.buffer[index - self.written]
+            return self._remap()[index]
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            return self.view()[start:stop:step]
+        if start >= self.written:
+            # Still buffered: a (small) copy, the buffer must stay resizable
+            return self.buffer[start - self.written:stop - self.written]
+        mapped = self.mapped if stop <= len(self.mapped) else self._remap()
+        if stop <= self.written:
+            return mapped[start:stop]
+        # Straddles the file and the buffer: copied
+        items = array(self.typecode, mapped[start:])
+        items.extend(self.buffer[:stop - self.written])
+        return items
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def close(self):
+        self.mapped = memoryview(array(self.typecode))
+        self.buffer = array(self.typecode)
+        self.file.close()
+
+
+class SpillStore:
+    # A temporary directory holding the column files of one analysis; close() deletes it.
+    # buffer_size is the number of items a column buffers before writing them out, and
+    # cache_size the number of Argument objects a spilled framework keeps in memory.
+    def __init__(self, directory=None, buffer_size=1 << 16, cache_size=1 << 16):
+        self.path = tempfile.mkdtemp(prefix='aspic-', dir=directory)
+        self.buffer_size = buffer_size
+        self.cache_size = cache_size
+        self.columns = []
+        self.arrays = 0
+
+    def column(self, name, typecode='i'):
+        # File names carry a counter, so a rebuilt arena never truncates a live column
+        path = os.path.join(self.path, f"{len(self.columns)}-{name}.{typecode}")
+        column = ColumnFile(path, typecode, self.buffer_size)
+        self.columns.append(column)
+        return column
+
+    def array(self, name, dtype, length):
+        # A fixed-size NumPy array backed by a file in the store, for results that are filled
+        # in out of order (e.g. a CSR index); deleted with the store like the columns
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        self.arrays += 1
+        path = os.path.join(self.path, f"array-{self.arrays}-{name}.{np.dtype(dtype).char}")
+        return np.memmap(path, dtype=dtype, mode='w+', shape=(length,))
+
+    def close(self):
+        for column in self.columns:
+            column.close()
+        self.columns = []
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AttackStore:
+    # (attacker, attacked) pairs kept as two argument id columns. Iterating yields Argument
+    # pairs resolved through 'arguments' (any sequence indexed by argument id); iter_ids()
+    # reads the ids straight from the mapped files.
+    def __init__(self, spill, arguments, name='attacks'):
+        self.arguments = arguments
+        self.attacker_ids = spill.column(f"{name}-attackers")
+        self.target_ids = spill.column(f"{name}-targets")
+
+    def __len__(self):
+        return len(self.attacker_ids)
+
+    def append(self, attack):
+        attacker, attacked = attack
+        self.attacker_ids.append(attacker.id)
+        self.target_ids.append(attacked.id)
+
+    def extend(self, attacks):
+        for attack in attacks:
+            self.append(attack)
+
+    def iter_ids(self):
+        return zip(self.attacker_ids, self.target_ids)
+
+    def iter_id_chunks(self, chunk_size=1 << 16):
+        # (attacker ids, target ids) NumPy arrays of at most chunk_size attacks, read from the
+        # mapped files without building a tuple per attack
+        attacker_ids, target_ids = self.attacker_ids.view(), self.target_ids.view()
+        for start in range(0, len(attacker_ids), chunk_size):
+            yield (np.asarray(attacker_ids[start:start + chunk_size]),
+                   np.asarray(target_ids[start:start + chunk_size]))
+
+    def __iter__(self):
+        arguments = self.arguments
+        for attacker_id, target_id in self.iter_ids():
+            yield arguments[attacker_id], arguments[target_id]
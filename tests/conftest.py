@@ -0,0 +1,37 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The modules live at the top of the repository, next to app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aspic_generator import Literal, Rule  # noqa: E402
+
+
+def make_random_rules(seed, atoms='abcde', count=9, max_premises=2):
+    # A small random rule base over a few atoms, so that rebuttals, undercuts and defeats all
+    # show up: strict and defeasible facts, and defeasible rules whose premises only use
+    # atoms before their conclusion's (the framework builds every argument, so the rules
+    # must not form a cycle), with weights 0-2
+    rng = random.Random(seed)
+    rules = []
+    for number in range(1, count + 1):
+        position = rng.randrange(len(atoms))
+        conclusion = Literal(atoms[position], is_negative=rng.random() < 0.5)
+        premises = []
+        if number > 3 and position and rng.random() < 0.7:
+            candidates = [Literal(atom, is_negative=negative) for atom in atoms[:position] for negative in (False, True)]
+            premises = rng.sample(candidates, min(len(candidates), rng.randint(1, max_premises)))
+        elif rng.random() < 0.15:
+            # An undercutter: the negation of another rule's name
+            conclusion = Literal(f'r{rng.randint(1, count)}', is_negative=True)
+        rules.append(Rule(premises, conclusion, is_defeasible=bool(premises) or rng.random() < 0.6,
+                          reference=f'r{number}', rule_weight=rng.randint(0, 2)))
+    return rules
+
+
+@pytest.fixture
+def random_rules():
+    return make_random_rules
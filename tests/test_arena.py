@@ -0,0 +1,33 @@
+import pytest
+
+from aspic_generator import ArgumentationFramework
+from storage import SpillStore
+
+
+def walk(argument):
+    # Brute-force closure: the argument and every sub-argument, by recursion
+    found = {argument.id: argument}
+    for sub_argument in argument.sub_arguments:
+        found.update(walk(sub_argument))
+    return found
+
+
+@pytest.mark.parametrize('spilled', [False, True])
+@pytest.mark.parametrize('seed', range(20))
+def test_closures_match_a_walk_of_the_sub_arguments(random_rules, seed, spilled):
+    with SpillStore(buffer_size=8, cache_size=4) as spill:
+        af = ArgumentationFramework(random_rules(seed), spill=spill if spilled else None)
+        arena = af.arena
+        for argument in af.get_arguments():
+            closure = walk(argument)
+            assert list(arena.closure_ids(argument.id)) == sorted(closure)
+            rule_ids = {af.rule_ids[sub_argument.top_rule] for sub_argument in closure.values()}
+            assert list(arena.rule_ids_used(argument.id)) == sorted(rule_ids)
+            assert arena.premise_ids(argument.id) == sorted(i for i, sub_argument in closure.items()
+                                                            if not sub_argument.sub_arguments)
+            assert arena.depths[argument.id] == max((arena.depths[sub.id] + 1 for sub in argument.sub_arguments),
+                                                    default=0)
+            for other_id in range(len(arena)):
+                assert arena.contains(argument.id, other_id) == (other_id in closure)
+            for rule_id in range(len(af.rules)):
+                assert arena.uses_rule_id(argument.id, rule_id) == (rule_id in rule_ids)
@@ -0,0 +1,55 @@
+import pytest
+
+from aspic_generator import ATTACK_MODES, Literal, Rule, analyze, factorize_rebuttals, find_defeated, tuple_of_rubutlals
+
+
+def pair_ids(pairs):
+    return {(attacker.id, attacked.id) for attacker, attacked in pairs}
+
+
+def test_factorized_rebuttals_keep_arguments_that_differ_by_top_rule():
+    a = Literal('a')
+    rules = [Rule([], a.negate(), reference='r1'), Rule([], a, reference='r2'),
+             Rule([], a, is_defeasible=True, reference='r3')]
+    analysis = analyze(rules)
+    names = {(attacker.name, attacked.name) for attacker, attacked in analysis.rebuttals}
+    assert names == {('A1', 'A2'), ('A1', 'A3'), ('A2', 'A1'), ('A3', 'A1')}
+
+
+def test_arguments_are_equal_only_to_the_same_record():
+    a = Literal('a')
+    rules = [Rule([], a, reference='r1'), Rule([], a, is_defeasible=True, reference='r2'),
+             Rule([a], Literal('b'), is_defeasible=True, reference='r3')]
+    af = analyze(rules).af
+    first, second = af.argument_by_conclusion[a]
+    assert first != second
+    assert len({first, second}) == 2
+    assert af.get_argument(first.id) == first
+    assert [arg.sub_arguments for arg in af.argument_by_conclusion[Literal('b')]] == [(first,), (second,)]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_factorized_rebuttals_match_tuple_of_rubutlals(random_rules, seed):
+    analysis = analyze(random_rules(seed))
+    af = analysis.af
+    expected = [pair for pairs in tuple_of_rubutlals(analysis.extended_rebuttals, af.get_arguments()).values()
+                for pair in pairs]
+    factorized = factorize_rebuttals(analysis.extended_rebuttals, af)
+    assert pair_ids(factorized) == pair_ids(expected)
+    assert len(factorized) == len(pair_ids(expected))
+    assert pair_ids(factorized.iter_defeats(af)) == pair_ids(find_defeated(af, expected))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_attack_modes_only_differ_in_their_rebuttals(random_rules, seed):
+    rules = random_rules(seed)
+    analyses = {mode: analyze(rules, attack_mode=mode) for mode in ATTACK_MODES}
+    unrestricted = analyses['unrestricted']
+    for mode, analysis in analyses.items():
+        assert pair_ids(analysis.undercuts) == pair_ids(unrestricted.undercuts)
+        assert pair_ids(analysis.rebuttals) <= pair_ids(unrestricted.rebuttals)
+        assert pair_ids(analysis.burden_attacks()) == pair_ids(analysis.attacks())
+        assert pair_ids(analysis.burden_attacks()) <= pair_ids(unrestricted.burden_attacks())
+        assert analysis.burden_numbers == analysis.af.compute_burdens_with_defeats(
+            analysis.defeats, max_depth=3, attacks=list(analysis.attacks()))
+    assert not len(analyses['undercut'].rebuttals)
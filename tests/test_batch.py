@@ -0,0 +1,65 @@
+import io
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import batch
+
+
+def test_iter_jsonl_reports_lines_that_are_not_objects():
+    stream = io.StringIO('[1, 2]\n\n{"id": "s1", "rules": []}\nnot json\n"text"\n')
+    scenarios = list(batch.iter_jsonl(stream, 'input.jsonl'))
+    assert [scenario['id'] for scenario in scenarios] == ['input.jsonl:1', 's1', 'input.jsonl:4', 'input.jsonl:5']
+    assert scenarios[0]['error'] == 'input.jsonl:1: expected a JSON object, got list'
+    assert 'error' not in scenarios[1]
+    assert 'error' in scenarios[2] and 'error' in scenarios[3]
+
+
+def test_iter_scenarios_reports_json_files_that_are_not_objects(tmp_path):
+    (tmp_path / 'a.json').write_text('[1, 2]', encoding='utf-8')
+    (tmp_path / 'b.json').write_text(json.dumps({'rules': [{'conclusion': 'a'}]}), encoding='utf-8')
+    scenarios = list(batch.iter_scenarios(str(tmp_path)))
+    assert [scenario['id'] for scenario in scenarios] == ['a', 'b']
+    assert 'expected a JSON object' in scenarios[0]['error']
+
+
+def test_run_batch_keeps_going_after_bad_scenarios():
+    lines = ['{"id": "good", "rules": [{"conclusion": "a"}, {"conclusion": "~a", "defeasible": true}]}',
+             '[1, 2]',
+             '{"id": "bad-rule", "rules": [{"premises": ["a"]}]}',
+             '{"id": "also-good", "rules": [{"conclusion": "b"}]}']
+    scenarios = batch.iter_jsonl(io.StringIO('\n'.join(lines)), 'input.jsonl')
+    results = {result['id']: result for result in batch.run_batch(scenarios, workers=2, max_pending=1)}
+    assert set(results) == {'good', 'input.jsonl:2', 'bad-rule', 'also-good'}
+    assert 'error' not in results['good'] and results['good']['arguments'] == 2
+    assert 'error' not in results['also-good']
+    assert 'error' in results['input.jsonl:2']
+    assert results['bad-rule']['error'].startswith('KeyError')
+
+
+def _crash_on_purpose(scenario, *options):
+    if scenario.get('id') == 'crash':
+        time.sleep(0.1)
+        os._exit(1)
+    # Slow enough to still be running when the other worker dies
+    time.sleep(0.3)
+    return batch_run_scenario(scenario, *options)
+
+
+batch_run_scenario = batch.run_scenario
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason='the patched worker function only reaches forked workers')
+def test_run_batch_only_fails_the_scenario_that_kills_its_worker(monkeypatch):
+    monkeypatch.setattr(batch, 'run_scenario', _crash_on_purpose)
+    scenarios = [{'id': f's{i}', 'rules': [{'conclusion': 'a'}, {'conclusion': '~a', 'defeasible': True}]}
+                 for i in range(8)]
+    scenarios.insert(3, {'id': 'crash'})
+    results = {result['id']: result for result in batch.run_batch(iter(scenarios), workers=2, max_pending=4)}
+    assert set(results) == {scenario['id'] for scenario in scenarios}
+    assert results['crash']['error'].startswith('BrokenProcessPool')
+    assert [name for name, result in results.items() if 'error' in result] == ['crash']
@@ -0,0 +1,50 @@
+import pytest
+
+from aspic_generator import ATTACK_MODES, PIPELINE_STAGES, ArgumentationFramework, Budget, analyze
+
+
+def cancel_at(stage, finished=False):
+    # A budget that cancels itself the first time 'stage' reports progress, or once it
+    # reports that it has finished
+    def on_progress(reported, done, total):
+        if reported == stage and (not finished or done == total):
+            budget.cancel()
+    budget = Budget(on_progress=on_progress, progress_interval=0)
+    return budget
+
+
+def test_expired_budget_returns_partial_results(random_rules):
+    budget = Budget(0)
+    analysis = analyze(random_rules(3), budget=budget)
+    assert budget.interrupted
+    assert not analysis.complete
+    assert analysis.incomplete == list(PIPELINE_STAGES)
+    assert analysis.burden_numbers == {}
+
+
+@pytest.mark.parametrize('attack_mode', ATTACK_MODES)
+def test_cancelled_budget_keeps_the_finished_stages(random_rules, attack_mode):
+    full = analyze(random_rules(8), attack_mode=attack_mode)
+    analysis = analyze(random_rules(8), attack_mode=attack_mode, budget=cancel_at('attacks', finished=True))
+    assert not analysis.complete
+    assert analysis.incomplete == ['defeats', 'burdens']
+    assert len(analysis.attacks()) == len(full.attacks())
+    assert analysis.burden_numbers == {}
+
+
+def test_cancelling_during_burdens_keeps_depth_zero(random_rules):
+    analysis = analyze(random_rules(8), budget=cancel_at('burdens'))
+    assert len(analysis.attacks())
+    assert analysis.incomplete == ['burdens']
+    assert len(analysis.burden_numbers) == analysis.af.count_arguments()
+    assert all(burdens == [1.0] for burdens in analysis.burden_numbers.values())
+
+
+def test_burdens_reuse_the_computed_attacks(random_rules, monkeypatch):
+    # Recomputing the attacks here ignored the budget and cost O(n^2) rebuttal checks
+    def fail(self):
+        raise AssertionError('the burdens stage recomputed the rebuttals')
+    monkeypatch.setattr(ArgumentationFramework, 'detect_rebuttals', fail)
+    monkeypatch.setattr(ArgumentationFramework, 'get_attacks', fail)
+    for attack_mode in ATTACK_MODES:
+        assert analyze(random_rules(7), attack_mode=attack_mode).complete
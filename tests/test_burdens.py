@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from aspic_generator import ATTACK_MODES, analyze, attacker_index
+from storage import SpillStore
+
+
+def definition_burdens(analysis, max_depth):
+    # Burden numbers straight from the definition, over the analysis' own attack pairs
+    names = [arg.name for arg in analysis.af.get_arguments()]
+    defeated = {attacked.name for _, attacked in analysis.defeats}
+    attackers = {name: [] for name in names}
+    for attacker, attacked in analysis.attacks():
+        if attacker.name not in defeated:
+            attackers[attacked.name].append(attacker.name)
+    burdens = {name: [1.0] for name in names}
+    for depth in range(1, max_depth + 1):
+        for name in names:
+            if name in defeated:
+                burdens[name].append(math.inf)
+            else:
+                burdens[name].append(1 + sum(1 / burdens[attacker][depth - 1] for attacker in attackers[name]))
+    return burdens
+
+
+@pytest.mark.parametrize('spilled', [False, True])
+@pytest.mark.parametrize('attack_mode', ATTACK_MODES)
+@pytest.mark.parametrize('seed', range(20))
+def test_burdens_match_the_definition(random_rules, seed, attack_mode, spilled):
+    with SpillStore(buffer_size=4, cache_size=3) as spill:
+        analysis = analyze(random_rules(seed), max_depth=4, attack_mode=attack_mode, spill=spill if spilled else None)
+        expected = definition_burdens(analysis, 4)
+        assert analysis.burden_numbers.keys() == expected.keys()
+        for name, burdens in expected.items():
+            assert analysis.burden_numbers[name] == pytest.approx(burdens)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1 << 16])
+def test_attacker_index_streams_every_relation(random_rules, chunk_size):
+    analysis = analyze(random_rules(21))
+    n = len(analysis.af.arena)
+    offsets, attacker_ids = attacker_index(analysis.attacks(), n)
+    expected = [[attacker.id for attacker, attacked in analysis.attacks() if attacked.id == i] for i in range(n)]
+    assert [attacker_ids[offsets[i]:offsets[i + 1]].tolist() for i in range(n)] == expected
+    chunks = list(analysis.attacks().iter_id_chunks(chunk_size))
+    assert np.concatenate([sources for sources, _ in chunks]).tolist() == \
+        [attacker.id for attacker, _ in analysis.attacks()]
+    assert all(len(sources) <= max(chunk_size, len(analysis.af.arena)) for sources, _ in chunks)
@@ -0,0 +1,48 @@
+import pytest
+
+from aspic_generator import ArgumentComparator, analyze
+
+
+def definition_keys(analysis):
+    # Sort key of every argument straight from the definition, larger is stronger: fewer
+    # defeaters, then fewer attackers
+    attacks = list(analysis.attacks())
+    keys = {}
+    for arg in analysis.af.get_arguments():
+        defeaters = sum(1 for _, attacked in analysis.defeats if attacked.id == arg.id)
+        attackers = sum(1 for _, attacked in attacks if attacked.id == arg.id)
+        keys[arg.name] = (1 / (1 + defeaters), -attackers)
+    return keys
+
+
+def named(pairs):
+    return [(arg.name, strength) for arg, strength in pairs]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_strongest_and_weakest_match_a_full_sort(random_rules, seed):
+    analysis = analyze(random_rules(seed))
+    comparator = ArgumentComparator.from_analysis(analysis)
+    keys = definition_keys(analysis)
+    # Full sorts, ties in argument order
+    strongest = [(name, keys[name][0]) for name in sorted(keys, key=keys.__getitem__, reverse=True)]
+    weakest = [(name, keys[name][0]) for name in sorted(keys, key=keys.__getitem__)]
+    for k in range(len(keys) + 2):
+        assert named(comparator.strongest(k)) == strongest[:k]
+        assert named(comparator.weakest(k)) == weakest[:k]
+    assert named(comparator.compare_arguments_with_preferences()) == strongest
+    arguments = list(analysis.af.get_arguments())
+    for first in arguments:
+        assert comparator.strength(first) == keys[first.name][0]
+        assert sorted(arg.name for arg in comparator.defeaters_of(first)) == \
+            sorted(attacker.name for attacker, attacked in analysis.defeats if attacked.id == first.id)
+        for second in arguments:
+            first_key, second_key = keys[first.name], keys[second.name]
+            assert comparator.compare(first, second) == (first_key > second_key) - (first_key < second_key)
+
+
+def test_no_arguments():
+    comparator = ArgumentComparator([], [], [])
+    assert comparator.strongest(3) == []
+    assert comparator.weakest(3) == []
+    assert comparator.compare_arguments_with_preferences() == []
@@ -0,0 +1,64 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from aspic_generator import analyze
+from extensions import PROPERTIES, ExtensionVerifier, verify_extensions
+
+
+def brute_force(names, defeats, candidate):
+    # Straight from the definitions
+    def defeated_by(members):
+        return {attacked for attacker, attacked in defeats if attacker in members}
+
+    def defends(members, argument):
+        return all(attacker in defeated_by(members) for attacker, attacked in defeats if attacked == argument)
+
+    conflict_free = not (candidate & defeated_by(candidate))
+    admissible = conflict_free and all(defends(candidate, argument) for argument in candidate)
+    return {
+        'conflict_free': conflict_free,
+        'admissible': admissible,
+        'complete': admissible and {argument for argument in names if defends(candidate, argument)} == candidate,
+        'stable': conflict_free and set(names) - candidate <= defeated_by(candidate),
+    }
+
+
+def every_subset(names):
+    return [set(subset) for size in range(len(names) + 1) for subset in itertools.combinations(names, size)]
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_verifier_matches_enumeration(seed):
+    rng = random.Random(seed)
+    names = [f'A{i}' for i in range(1, rng.randint(1, 8) + 1)]
+    defeats = [(attacker, attacked) for attacker in names for attacked in names if rng.random() < 0.25]
+    candidates = every_subset(names)
+    # Small chunks, so that several chunks and several 64-bit words are checked
+    checks = ExtensionVerifier(names, defeats).verify(candidates, chunk_size=100)
+    for index, candidate in enumerate(candidates):
+        expected = brute_force(names, defeats, candidate)
+        assert {name: bool(checks[name][index]) for name in PROPERTIES} == expected, candidate
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_verify_extensions_on_an_analysis(random_rules, seed):
+    analysis = analyze(random_rules(seed))
+    names = [arg.name for arg in analysis.af.get_arguments()]
+    if len(names) > 10:
+        pytest.skip('only small frameworks are enumerated')
+    defeats = {(attacker.name, attacked.name) for attacker, attacked in analysis.defeats}
+    candidates = every_subset(names)
+    checks = verify_extensions(analysis, candidates)
+    members = np.array([[name in candidate for name in names] for candidate in candidates])
+    assert {name: checks[name].tolist() for name in PROPERTIES} == \
+        {name: verify_extensions(analysis, members)[name].tolist() for name in PROPERTIES}
+    for index, candidate in enumerate(candidates):
+        assert {name: bool(checks[name][index]) for name in PROPERTIES} == brute_force(names, defeats, candidate)
+
+
+def test_unknown_argument():
+    with pytest.raises(ValueError, match='unknown argument'):
+        ExtensionVerifier(['a', 'b'], [('a', 'b')]).verify([{'c'}])
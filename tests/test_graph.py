@@ -0,0 +1,18 @@
+import pytest
+from matplotlib.figure import Figure
+
+from aspic_generator import GRAPH_COLLAPSE_MODES, analyze, create_argument_graph, defeasible_rules, strict_rules
+
+
+@pytest.mark.parametrize('collapse', GRAPH_COLLAPSE_MODES)
+def test_create_argument_graph(collapse):
+    analysis = analyze(strict_rules + defeasible_rules)
+    fig = create_argument_graph(analysis.af.get_arguments(), analysis.attacks(), collapse=collapse, max_edges=10)
+    assert isinstance(fig, Figure)
+    assert 'of {} attacks shown'.format(analysis.count_attacks()) in fig.axes[0].get_title()
+
+
+def test_create_argument_graph_rejects_unknown_collapse_mode():
+    analysis = analyze(strict_rules + defeasible_rules)
+    with pytest.raises(ValueError, match='unknown collapse mode'):
+        create_argument_graph(analysis.af.get_arguments(), analysis.attacks(), collapse='rule')
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+import graph_io
+from aspic_generator import analyze
+
+
+def names(pairs):
+    return [(attacker.name, attacked.name) for attacker, attacked in pairs]
+
+
+def read_back(format, text):
+    handle = io.StringIO(text)
+    if format == 'apx':
+        return graph_io.read_apx(handle)
+    if format == 'tgf':
+        return graph_io.read_tgf(handle)
+    return graph_io.read_graphml(handle)
+
+
+@pytest.mark.parametrize('format', ['apx', 'tgf', 'graphml'])
+@pytest.mark.parametrize('seed', range(15))
+def test_analysis_round_trips(random_rules, seed, format):
+    analysis = analyze(random_rules(seed))
+    af = analysis.af
+    handle = io.StringIO()
+    graph_io.write_analysis(handle, analysis, format=format)
+    read = read_back(format, handle.getvalue())
+    assert read[0] == [arg.name for arg in af.get_arguments()]
+    assert read[1] == names(analysis.attacks())
+    assert graph_io.resolve_pairs(af, read[1]) == list(analysis.attacks())
+    if format != 'apx':
+        assert read[2] == names(analysis.defeats)
+        assert graph_io.resolve_pairs(af, read[2]) == list(analysis.defeats)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_apx_defeats_round_trip(random_rules, seed):
+    analysis = analyze(random_rules(seed))
+    handle = io.StringIO()
+    graph_io.write_analysis(handle, analysis, format='apx', relation=graph_io.DEFEAT)
+    assert graph_io.read_apx(io.StringIO(handle.getvalue()))[1] == names(analysis.defeats)
+
+
+def test_graphml_nodes_keep_their_rule(random_rules):
+    analysis = analyze(random_rules(3))
+    handle = io.StringIO()
+    graph_io.write_analysis(handle, analysis)
+    nodes = [entry for entry in graph_io.iter_graphml(io.StringIO(handle.getvalue())) if entry[0] == 'arg']
+    assert nodes == [('arg', arg.name, {'conclusion': str(arg.top_rule.conclusion), 'rule': arg.top_rule.reference,
+                                        'defeasible': 'true' if arg.top_rule.is_defeasible else 'false'})
+                     for arg in analysis.af.get_arguments()]
+
+
+@pytest.mark.parametrize('text, line', [('arg(a).\natt(a).\n', 2), ('arg(a). arg(b)\n', 1), ('arg(a, b).\n', 1)])
+def test_malformed_apx(text, line):
+    with pytest.raises(graph_io.GraphFormatError) as error:
+        graph_io.read_apx(io.StringIO(text))
+    assert error.value.line == line
+
+
+def test_malformed_tgf():
+    with pytest.raises(graph_io.GraphFormatError) as error:
+        graph_io.read_tgf(io.StringIO('a x\nb y\n#\na b attack\nb\n'))
+    assert error.value.line == 5
+
+
+def test_resolve_pairs_rejects_unknown_arguments(random_rules):
+    af = analyze(random_rules(0)).af
+    with pytest.raises(ValueError, match="unknown argument 'A999'"):
+        graph_io.resolve_pairs(af, [('A1', 'A999')])
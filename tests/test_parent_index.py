@@ -0,0 +1,27 @@
+import pytest
+
+from aspic_generator import ArgumentationFramework, Literal, Rule
+from storage import SpillStore
+
+
+def test_parents_of_arguments_that_differ_by_top_rule():
+    a = Literal('a')
+    af = ArgumentationFramework([Rule([], a, reference='r1'), Rule([], a, is_defeasible=True, reference='r2'),
+                                 Rule([a], Literal('b'), is_defeasible=True, reference='r3')])
+    strict, defeasible = af.argument_by_conclusion[a]
+    assert [parent.name for parent in af.parents_of(strict)] == ['A3']
+    assert [parent.name for parent in af.parents_of(defeasible)] == ['A4']
+    assert [arg.name for arg in af.get_super_arguments(defeasible)] == ['A2', 'A4']
+
+
+@pytest.mark.parametrize('spilled', [False, True])
+@pytest.mark.parametrize('seed', range(20))
+def test_super_arguments_match_a_scan(random_rules, seed, spilled):
+    with SpillStore(buffer_size=4, cache_size=3) as spill:
+        af = ArgumentationFramework(random_rules(seed), spill=spill if spilled else None)
+        arguments = list(af.get_arguments())
+        for argument in arguments:
+            parents = [arg.id for arg in arguments if argument.id in {sub.id for sub in arg.sub_arguments}]
+            assert [parent.id for parent in af.parents_of(argument)] == parents
+            supers = {arg.id for arg in arguments if af.arena.contains(arg.id, argument.id)}
+            assert sorted(arg.id for arg in af.get_super_arguments(argument)) == sorted(supers)
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+import rule_parser
+from aspic_generator import Literal, Rule
+
+
+def rule_fields(rule):
+    return rule.premises, rule.conclusion, rule.is_defeasible, rule.rule_weight
+
+
+def test_dump_rules_round_trips():
+    rules = [Rule([], Literal('a'), reference='r1'),
+             Rule([Literal('b'), Literal('d', is_negative=True)], Literal('c'), reference='r2'),
+             Rule([Literal('a')], Literal('d', is_negative=True), is_defeasible=True, reference='r4', rule_weight=2),
+             Rule([Literal('c', is_negative=True)], Literal('r4', is_negative=True), is_defeasible=True,
+                  reference='r9', rule_weight=0.5)]
+    stream = io.StringIO()
+    rule_parser.dump_rules(rules, stream)
+    assert rule_parser.parse_rules(stream.getvalue()) == rules
+
+
+def test_rules_without_reference_round_trip():
+    # Rules added from the app have an empty reference
+    rules = [Rule([Literal('a')], Literal('b')), Rule([], Literal('a'), is_defeasible=True, rule_weight=1)]
+    stream = io.StringIO()
+    rule_parser.dump_rules(rules, stream)
+    assert stream.getvalue() == 'a -> b\n=> a @ 1\n'
+    parsed = rule_parser.parse_rules(stream.getvalue())
+    assert [rule_fields(rule) for rule in parsed] == [rule_fields(rule) for rule in rules]
+    assert [rule.reference for rule in parsed] == ['r1', 'r2']
+
+
+@pytest.mark.parametrize('line, column', [(': a -> b', 1), ('r1: a b -> c', 6), ('r1: a -> b -> c', 12),
+                                          ('r1: a -> b @ x', 13), ('r1: a', 1)])
+def test_syntax_errors_point_at_the_problem(line, column):
+    with pytest.raises(rule_parser.RuleSyntaxError) as error:
+        rule_parser.parse_rules(line)
+    assert (error.value.line, error.value.column) == (1, column)
+
+
+def test_rules_without_reference_skip_taken_names():
+    rules = rule_parser.parse_rules('r2: => a\n=> b\nr9: => ~r2\n=> c')
+    assert [rule.reference for rule in rules] == ['r2', 'r3', 'r9', 'r4']
+
+
+def test_mixed_base_round_trips_without_sharing_references():
+    rules = [Rule([], Literal('a'), reference='r2'), Rule([], Literal('b')),
+             Rule([], Literal('r2', is_negative=True), is_defeasible=True, reference='r9')]
+    stream = io.StringIO()
+    rule_parser.dump_rules(rules, stream)
+    parsed = rule_parser.parse_rules(stream.getvalue())
+    assert [rule.reference for rule in parsed] == ['r2', 'r3', 'r9']
+
+
+@pytest.mark.parametrize('text, line', [('r1: => a\nr1: => b', 2), ('=> a\nr1: -> b', 2),
+                                        ('r2: => a\n\nr2: b -> c', 3)])
+def test_duplicate_references_are_rejected(text, line):
+    with pytest.raises(rule_parser.RuleSyntaxError, match='duplicate rule reference') as error:
+        rule_parser.parse_rules(text)
+    assert (error.value.line, error.value.column) == (line, 1)
@@ -0,0 +1,40 @@
+import pytest
+
+import semantics
+from semantics import DefeatGraph
+
+
+def test_duplicate_defeats_count_once():
+    graph = DefeatGraph(['a', 'b'], [('a', 'b'), ('a', 'b')])
+    assert len(graph.src) == 1
+    assert semantics.h_categorizer(graph)['scores'] == pytest.approx({'a': 1.0, 'b': 0.5})
+
+
+def test_empty_graph():
+    result = semantics.discussion_based(DefeatGraph([], []))
+    assert result['ranking'] == [] and result['converged']
+
+
+def test_h_categorizer_and_counting_scores():
+    graph = DefeatGraph(['a', 'b', 'c'], [('a', 'b'), ('b', 'c')])
+    assert semantics.h_categorizer(graph)['scores'] == pytest.approx({'a': 1.0, 'b': 0.5, 'c': 2 / 3})
+    assert semantics.counting(graph, alpha=0.5)['ranking'] == ['a', 'c', 'b']
+
+
+def test_discussion_warm_start_only_resumes_on_the_same_graph():
+    first = semantics.discussion_based(DefeatGraph(['A1', 'A2', 'A3'], [('A1', 'A2'), ('A2', 'A3')]))
+    assert first['ranking'] == ['A1', 'A3', 'A2']
+    # Same names, different defeats (e.g. after the rule base changed)
+    changed = DefeatGraph(['A1', 'A2', 'A3'], [('A3', 'A2'), ('A2', 'A1')])
+    assert semantics.discussion_based(changed, initial=first) == semantics.discussion_based(changed)
+    assert semantics.discussion_based(changed, initial=first)['ranking'] == ['A3', 'A1', 'A2']
+    same = DefeatGraph(['A1', 'A2', 'A3'], [('A2', 'A3'), ('A1', 'A2')])
+    assert semantics.discussion_based(same, initial=first)['scores'] == first['scores']
+
+
+def test_discussion_patience_cutoff_is_not_convergence():
+    graph = DefeatGraph(['a', 'b'], [('a', 'b'), ('b', 'a')])
+    result = semantics.discussion_based(graph, patience=3, max_steps=50)
+    assert not result['converged']
+    assert result['iterations'] < 50
+    assert semantics.discussion_based(DefeatGraph(['a', 'b'], [('a', 'b')]))['converged']
@@ -0,0 +1,46 @@
+import pytest
+
+from aspic_generator import ATTACK_MODES, analyze
+from storage import SpillStore
+
+
+def test_column_reads_across_the_file_and_the_buffer():
+    with SpillStore(buffer_size=4) as spill:
+        column = spill.column('values', 'q')
+        expected = []
+        for value in range(23):
+            column.append(value * 3)
+            expected.append(value * 3)
+            # Every prefix, slice and item, whether written out, mapped or still buffered
+            assert len(column) == len(expected)
+            assert column[len(expected) - 1] == expected[-1]
+            assert column[-1] == expected[-1]
+            for start in range(0, len(expected), 3):
+                assert list(column[start:len(expected)]) == expected[start:]
+                assert list(column[start:start + 5]) == expected[start:start + 5]
+        assert list(column[::4]) == expected[::4]
+        column.extend(range(5))
+        assert list(column) == expected + list(range(5))
+
+
+def summary(analysis):
+    # Everything the pipeline computed, by argument id
+    return {
+        'arguments': [(arg.name, arg.top_rule, [sub.id for sub in arg.sub_arguments])
+                      for arg in analysis.af.get_arguments()],
+        'undercuts': sorted((attacker.id, attacked.id) for attacker, attacked in analysis.undercuts),
+        'rebuttals': sorted((attacker.id, attacked.id) for attacker, attacked in analysis.rebuttals),
+        'defeats': sorted((attacker.id, attacked.id) for attacker, attacked in analysis.defeats),
+        'burden_numbers': analysis.burden_numbers,
+        'ranked_arguments': analysis.ranked_arguments,
+    }
+
+
+@pytest.mark.parametrize('attack_mode', ATTACK_MODES)
+@pytest.mark.parametrize('seed', range(25))
+def test_spilled_analysis_matches_in_memory(random_rules, seed, attack_mode):
+    rules = random_rules(seed)
+    expected = summary(analyze(rules, attack_mode=attack_mode))
+    # Tiny buffers and caches, so that reads go through the files and arguments are rebuilt
+    with SpillStore(buffer_size=4, cache_size=3) as spill:
+        assert summary(analyze(rules, attack_mode=attack_mode, spill=spill)) == expected
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from aspic_generator import ATTACK_MODES, PIPELINE_STAGES, Analysis, Rule, analyze, run_analysis, sweep_rule_weights
+
+
+def reweighted(rules, assignment):
+    return [Rule(rule.premises, rule.conclusion, is_defeasible=rule.is_defeasible, reference=rule.reference,
+                 rule_weight=assignment.get(rule.reference, rule.rule_weight)) for rule in rules]
+
+
+def random_assignments(rules, seed, count=5):
+    rng = random.Random(seed)
+    references = [rule.reference for rule in rules]
+    return [{reference: rng.randint(0, 3) for reference in rng.sample(references, rng.randint(1, len(references)))}
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('attack_mode', ATTACK_MODES)
+@pytest.mark.parametrize('seed', range(40))
+def test_sweep_matches_a_full_reanalysis(random_rules, seed, attack_mode):
+    rules = random_rules(seed)
+    assignments = random_assignments(rules, seed)
+    points = sweep_rule_weights(rules, assignments, attack_mode=attack_mode, chunk_size=2)
+    assert [point['weights'] for point in points] == [{}] + assignments
+    for point in points:
+        analysis = analyze(reweighted(rules, point['weights']), attack_mode=attack_mode)
+        defeats = {(attacker.name, attacked.name) for attacker, attacked in analysis.defeats}
+        assert point['defeats'] == len(defeats)
+        assert sorted(point['defeated_arguments']) == sorted({attacked for _, attacked in defeats})
+        assert point['burden_numbers'] == analysis.burden_numbers
+        assert point['ranking'] == analysis.ranked_arguments
+        baseline = {(attacker.name, attacked.name) for attacker, attacked in analyze(rules, attack_mode=attack_mode).defeats}
+        assert set(point['defeats_added']) == defeats - baseline
+        assert set(point['defeats_removed']) == baseline - defeats
+
+
+def test_run_analysis_can_stop_after_a_stage(random_rules):
+    analysis = run_analysis(Analysis(random_rules(8)), stop_after='attacks')
+    assert analysis.incomplete == list(PIPELINE_STAGES[2:])
+    assert len(analysis.attacks()) and not analysis.defeats and not analysis.burden_numbers